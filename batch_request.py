@@ -40,31 +40,61 @@ import subprocess
 import sys
 import os
 import shutil
+import shlex
 import itertools
 import re
-import time
-import base64
-from io import BytesIO
+import codecs
+import threading
+import importlib.util
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import List, Optional, TextIO
 
 
 # ============ 日志管理 ============
 
 class TeeWriter:
-    """同时写入多个输出流的类"""
-    def __init__(self, *writers):
+    """
+    同时写入多个输出流的类（线程安全，并发运行时整块写入不会交错）
+    
+    写入内容先进入内部缓冲，累计达到 buffer_size 且遇到换行（或超过 MAX_BUFFER_SIZE）时
+    才合并为一次写入各输出流；flush() 总是写出全部缓冲并刷新各输出流。
+    buffer_size 为 0 时相当于行缓冲。
+    """
+    MAX_BUFFER_SIZE = 1 << 20
+    
+    def __init__(self, *writers, buffer_size: int = 0):
         self.writers = writers
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._buf: List[str] = []
+        self._size = 0
     
     def write(self, text):
-        for w in self.writers:
-            w.write(text)
-            w.flush()
+        # 不在每次写入时刷新，由调用方按块调用 flush()
+        with self._lock:
+            self._buf.append(text)
+            self._size += len(text)
+            if self._size >= self.MAX_BUFFER_SIZE or (self._size >= self.buffer_size and '\n' in text):
+                self._drain()
     
     def flush(self):
+        with self._lock:
+            self._drain()
+            for w in self.writers:
+                w.flush()
+    
+    def _drain(self):
+        """把缓冲内容合并后写入各输出流（调用方需持有锁）"""
+        if not self._buf:
+            return
+        data = ''.join(self._buf)
+        self._buf.clear()
+        self._size = 0
         for w in self.writers:
-            w.flush()
+            w.write(data)
 
 
 # 全局日志文件句柄
@@ -108,17 +138,20 @@ def setup_logging(log_path: str):
     os.makedirs(os.path.dirname(log_path), exist_ok=True)
     _log_file = open(log_path, 'w', encoding='utf-8')
     _original_stdout = sys.stdout
-    sys.stdout = TeeWriter(_original_stdout, _log_file)
+    # 详细输出模式下保持行缓冲，保证交互体验；否则按块缓冲以减少写入次数
+    sys.stdout = TeeWriter(_original_stdout, _log_file, buffer_size=0 if VERBOSE else TEE_BUFFER_SIZE)
     
     return _log_file
 
 
 def close_logging():
-    """关闭日志文件"""
+    """关闭日志文件（可重复调用，已关闭时什么都不做）"""
     global _log_file, _original_stdout
     
     if _original_stdout:
+        sys.stdout.flush()  # 写出 TeeWriter 中剩余的缓冲
         sys.stdout = _original_stdout
+        _original_stdout = None
     
     if _log_file:
         _log_file.close()
@@ -144,6 +177,24 @@ args_combo = [
 # 是否显示详细输出
 VERBOSE = True
 
+# 最大并发运行数（每次运行都是独立的 request.py 子进程）
+# - 1: 串行运行，实时输出子进程日志
+# - >1: 并发运行，每次运行的输出先缓冲，结束后整块写入终端和日志
+PARALLEL = 1
+
+# request.py 用 fcntl.flock 保证任务编号的分配是原子的；没有 fcntl 的平台上
+# 并发启动的 request.py 可能拿到相同的任务编号，因此只能串行运行
+_TASK_NUM_LOCK_AVAILABLE = importlib.util.find_spec('fcntl') is not None
+
+# 读取子进程输出时每次读取的最大字节数
+READ_CHUNK_SIZE = 65536
+
+# 非详细输出模式下，日志（终端 + batch.log）累计多少字符后才写出一次
+TEE_BUFFER_SIZE = 65536
+
+# 子进程环境变量（只构建一次），禁用 Python 的输出缓冲以便实时输出
+_CHILD_ENV = {**os.environ, 'PYTHONUNBUFFERED': '1'}
+
 # 是否在完成后生成报告
 GENERATE_REPORT = True
 
@@ -176,83 +227,181 @@ class RunResult:
     max_tasks_arg: Optional[int] = None
 
 
+# 预编译的正则（避免每次调用时查找 re 模块缓存）
+_RE_PROVIDER = re.compile(r'--provider\s+(\S+)')
+_RE_MODEL = re.compile(r'--model\s+["\']?([^"\']+)["\']?')
+_RE_CATEGORIES = re.compile(r'--categories\s+(\S+)')
+_RE_MAX_TASKS = re.compile(r'--max_tasks\s+(\d+)')
+_RE_TASK_NUM = re.compile(r'🔢 任务编号:\s*(\d+)')
+_RE_JOB_FOLDER = re.compile(r'✅ Job 文件夹已重命名:\s*(\S+)')
+_RE_TEMP_JOB_FOLDER = re.compile(r'📁 创建临时 job 文件夹:\s*(\S+)')
+_RE_OUTPUT_FILE = re.compile(r'✅ 文件已重命名:\s*(\S+\.jsonl)')
+_RE_OUTPUT_FILE2 = re.compile(r'输出文件:\s*(\S+\.jsonl)')
+_RE_VSP_DIR = re.compile(r'✅ VSP 详细输出目录已重命名:\s*(\S+)')
+_RE_EVAL_FILE = re.compile(r'✅ 评估指标已保存:\s*(\S+\.csv)')
+_RE_SUMMARY_FILE = re.compile(r'✅ Summary 已保存:\s*(\S+\.html)')
+_RE_TOTAL_TASKS = re.compile(r'总任务数:\s*(\d+)')
+_RE_STOP_REASON = re.compile(r"自动停止原因:\s*(.+)")
+
+
 def parse_args_str(args_str: str) -> dict:
     """从参数字符串中提取关键信息"""
     info = {}
     
     # 提取 provider
-    provider_match = re.search(r'--provider\s+(\S+)', args_str)
+    provider_match = _RE_PROVIDER.search(args_str)
     if provider_match:
         info['provider'] = provider_match.group(1)
     
     # 提取 model（可能带引号）
-    model_match = re.search(r'--model\s+["\']?([^"\']+)["\']?', args_str)
+    model_match = _RE_MODEL.search(args_str)
     if model_match:
         info['model'] = model_match.group(1).strip()
     
     # 提取 categories
-    categories_match = re.search(r'--categories\s+(\S+)', args_str)
+    categories_match = _RE_CATEGORIES.search(args_str)
     if categories_match:
         info['categories'] = categories_match.group(1)
     
     # 提取 max_tasks
-    max_tasks_match = re.search(r'--max_tasks\s+(\d+)', args_str)
+    max_tasks_match = _RE_MAX_TASKS.search(args_str)
     if max_tasks_match:
         info['max_tasks_arg'] = int(max_tasks_match.group(1))
     
     return info
 
 
-def parse_output(output: str) -> dict:
-    """从 request.py 的输出中提取关键信息"""
-    info = {}
+# request.py 输出中需要提取的字段（每个字段只取第一次匹配）
+# 字段名 -> (正则开头的固定文本, 正则)，固定文本用于在正则匹配前快速定位候选位置
+_OUTPUT_PATTERNS = {
+    'task_num': ('🔢 任务编号:', _RE_TASK_NUM),
+    'job_folder': ('✅ Job 文件夹已重命名:', _RE_JOB_FOLDER),
+    'temp_job_folder': ('📁 创建临时 job 文件夹:', _RE_TEMP_JOB_FOLDER),
+    'output_file': ('✅ 文件已重命名:', _RE_OUTPUT_FILE),
+    'output_file2': ('输出文件:', _RE_OUTPUT_FILE2),
+    'vsp_dir': ('✅ VSP 详细输出目录已重命名:', _RE_VSP_DIR),
+    'eval_file': ('✅ 评估指标已保存:', _RE_EVAL_FILE),
+    'summary_file': ('✅ Summary 已保存:', _RE_SUMMARY_FILE),
+    'total_tasks': ('总任务数:', _RE_TOTAL_TASKS),
+    'stop_reason': ('自动停止原因:', _RE_STOP_REASON),
+}
+_MAX_PREFIX_LEN = max(len(prefix) for prefix, _ in _OUTPUT_PATTERNS.values())
+
+_RE_NON_SPACE = re.compile(r'\S')
+
+
+def _is_value_complete(text: str, pos: int) -> bool:
+    """
+    判断固定文本之后（从 pos 开始）的值是否已经完整到达
     
-    # 提取任务编号
-    task_num_match = re.search(r'🔢 任务编号:\s*(\d+)', output)
-    if task_num_match:
-        info['task_num'] = int(task_num_match.group(1))
+    所有字段的正则都是「固定文本 + 任意空白 + 不跨行的值」：空白可以跨行，
+    所以值从固定文本后第一个非空白字符开始，遇到换行时一定已经结束。
+    """
+    match = _RE_NON_SPACE.search(text, pos)
+    return match is not None and text.find('\n', match.start()) >= 0
+
+
+class OutputScanner:
+    """
+    增量扫描 request.py 的输出
     
-    # 提取 Job 文件夹路径（重命名后的）
-    job_folder_match = re.search(r'✅ Job 文件夹已重命名:\s*(\S+)', output)
-    if job_folder_match:
-        info['job_folder'] = job_folder_match.group(1)
-    else:
-        # 尝试从创建临时文件夹的日志提取
-        temp_folder_match = re.search(r'📁 创建临时 job 文件夹:\s*(\S+)', output)
-        if temp_folder_match:
-            info['job_folder'] = temp_folder_match.group(1)
-    
-    # 提取输出文件路径（重命名后的）
-    output_file_match = re.search(r'✅ 文件已重命名:\s*(\S+\.jsonl)', output)
-    if output_file_match:
-        info['output_file'] = output_file_match.group(1)
-    else:
-        # 尝试从"输出文件:"行提取
-        output_file_match2 = re.search(r'输出文件:\s*(\S+\.jsonl)', output)
-        if output_file_match2:
-            info['output_file'] = output_file_match2.group(1)
-    
-    # 提取 VSP 详细输出目录
-    vsp_dir_match = re.search(r'✅ VSP 详细输出目录已重命名:\s*(\S+)', output)
-    if vsp_dir_match:
-        info['vsp_dir'] = vsp_dir_match.group(1)
-    
-    # 提取评估结果文件
-    eval_file_match = re.search(r'✅ 评估指标已保存:\s*(\S+\.csv)', output)
-    if eval_file_match:
-        info['eval_file'] = eval_file_match.group(1)
-    
-    # 提取 Summary HTML
-    summary_match = re.search(r'✅ Summary 已保存:\s*(\S+\.html)', output)
-    if summary_match:
-        info['summary_file'] = summary_match.group(1)
-    
-    # 提取总任务数
-    total_tasks_match = re.search(r'总任务数:\s*(\d+)', output)
-    if total_tasks_match:
-        info['total_tasks'] = int(total_tasks_match.group(1))
+    每读到一块输出就调用 feed()，已匹配到的字段不再扫描，
+    无需保存全部输出再整体搜索。输出可以按任意位置分块：
+    值还没有完整到达的字段（包括值在下一行或下一块才出现的情况），
+    从其固定文本开始的内容会留到下一次扫描，结果与对完整输出做正则搜索一致。
     
-    return info
+    留待下一次扫描的内容超过 MAX_PENDING_SIZE 时（如没有换行、用回车符刷新的进度条），
+    不再等待后续输出，按已有内容判定，避免无限增长。
+    """
+    MAX_PENDING_SIZE = 65536
+    
+    def __init__(self):
+        self.matches = {}
+        self._pending = dict(_OUTPUT_PATTERNS)
+        self._partial = ''
+    
+    def feed(self, text: str):
+        """喂入一段输出（可以是任意分块）"""
+        text = self._partial + text
+        keep = self._scan(text)
+        if len(text) - keep > self.MAX_PENDING_SIZE:
+            self._scan(text[keep:], final=True)
+            # 只保留末尾可能只到达了一部分的固定文本
+            keep = len(text) - _MAX_PREFIX_LEN + 1
+        self._partial = text[keep:]
+    
+    def close(self):
+        """输出结束，按已有内容判定剩余的字段"""
+        self._scan(self._partial, final=True)
+        self._partial = ''
+    
+    def _scan(self, text: str, final: bool = False) -> int:
+        """
+        扫描 text 中还未匹配的字段
+        
+        Returns:
+            需要留到下一次扫描的内容的起始位置
+        """
+        keep = len(text)
+        for key, (prefix, pattern) in list(self._pending.items()):
+            pos = 0
+            while True:
+                start = text.find(prefix, pos)
+                if start < 0:
+                    # 末尾可能是只到达了一部分的固定文本
+                    keep = min(keep, max(pos, len(text) - len(prefix) + 1))
+                    break
+                if not final and not _is_value_complete(text, start + len(prefix)):
+                    keep = min(keep, start)
+                    break
+                match = pattern.match(text, start)
+                if match:
+                    self.matches[key] = match.group(1)
+                    del self._pending[key]
+                    break
+                pos = start + 1
+        return keep
+    
+    @property
+    def stop_reason(self) -> Optional[str]:
+        """request.py 内部自动停止时打印的原因"""
+        reason = self.matches.get('stop_reason')
+        return reason.strip() if reason else None
+    
+    def result(self) -> dict:
+        """整理为 parse_output 的返回格式"""
+        m = self.matches
+        info = {}
+        
+        if 'task_num' in m:
+            info['task_num'] = int(m['task_num'])
+        
+        # Job 文件夹路径：优先使用重命名后的，否则使用临时文件夹
+        job_folder = m.get('job_folder') or m.get('temp_job_folder')
+        if job_folder:
+            info['job_folder'] = job_folder
+        
+        # 输出文件路径：优先使用重命名后的，否则使用"输出文件:"行
+        output_file = m.get('output_file') or m.get('output_file2')
+        if output_file:
+            info['output_file'] = output_file
+        
+        for key in ('vsp_dir', 'eval_file', 'summary_file'):
+            if key in m:
+                info[key] = m[key]
+        
+        if 'total_tasks' in m:
+            info['total_tasks'] = int(m['total_tasks'])
+        
+        return info
+
+
+def parse_output(output: str) -> dict:
+    """从 request.py 的输出中提取关键信息"""
+    scanner = OutputScanner()
+    scanner.feed(output)
+    scanner.close()
+    return scanner.result()
 
 
 def format_duration(td: timedelta) -> str:
@@ -291,6 +440,14 @@ def generate_combinations(args_combo):
         else:
             raise ValueError(f"不支持的参数类型: {type(item)}")
     
+    # 常见情况：只有一个列表变体，直接拼接固定参数，无需计算笛卡尔积
+    list_positions = [i for i, item in enumerate(args_combo) if isinstance(item, list)]
+    if len(list_positions) == 1:
+        pos = list_positions[0]
+        prefix = "".join(item + " " for item in args_combo[:pos])
+        suffix = "".join(" " + item for item in args_combo[pos + 1:])
+        return [prefix + variant + suffix for variant in args_combo[pos]]
+    
     # 生成笛卡尔积
     combinations = list(itertools.product(*normalized))
     
@@ -303,7 +460,40 @@ def generate_combinations(args_combo):
     return result
 
 
-def run_request(args_str: str, run_index: int, total_runs: int) -> RunResult:
+def stream_output(process: subprocess.Popen, out: TextIO, scanner: Optional[OutputScanner] = None):
+    """
+    按块读取子进程（二进制管道）的输出，实时写入 out
+    
+    每读到一块只写入并刷新一次，而不是逐行刷新。
+    
+    Args:
+        process: 以 stdout=PIPE 启动的子进程
+        out: 输出流
+        scanner: 可选，同时用于提取关键信息
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        # read1 有多少数据就返回多少，不会等满一整块，保证输出实时
+        chunk = process.stdout.read1(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        text = decoder.decode(chunk)
+        out.write(text)  # 实时显示
+        out.flush()      # 每块刷新一次到屏幕和日志
+        if scanner:
+            scanner.feed(text)
+    
+    text = decoder.decode(b'', final=True)
+    if text:
+        out.write(text)
+        out.flush()
+        if scanner:
+            scanner.feed(text)
+    if scanner:
+        scanner.close()
+
+
+def run_request(args_str: str, run_index: int, total_runs: int, buffered: bool = False) -> RunResult:
     """
     运行一次 request.py
     
@@ -311,21 +501,35 @@ def run_request(args_str: str, run_index: int, total_runs: int) -> RunResult:
         args_str: 命令行参数字符串
         run_index: 当前运行序号（从1开始）
         total_runs: 总运行次数
+        buffered: 是否缓冲本次运行的输出，结束后一次性写入（并发运行时使用）
         
     Returns:
         RunResult 对象，包含运行结果的详细信息
     """
-    print(f"\n{'='*80}")
-    print(f"🚀 运行 [{run_index}/{total_runs}]")
-    print(f"{'='*80}")
-    print(f"📋 参数: {args_str}")
-    print(f"{'='*80}\n")
+    if not buffered:
+        return _run_request(args_str, run_index, total_runs, sys.stdout)
+    
+    out = StringIO()
+    try:
+        return _run_request(args_str, run_index, total_runs, out)
+    finally:
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+
+
+def _run_request(args_str: str, run_index: int, total_runs: int, out: TextIO) -> RunResult:
+    """run_request 的实际实现，所有输出写入 out"""
+    print(f"\n{'='*80}", file=out)
+    print(f"🚀 运行 [{run_index}/{total_runs}]", file=out)
+    print(f"{'='*80}", file=out)
+    print(f"📋 参数: {args_str}", file=out)
+    print(f"{'='*80}\n", file=out)
     
     # 构建完整命令
     cmd = f"python request.py {args_str}"
     
     if VERBOSE:
-        print(f"💻 执行命令: {cmd}\n")
+        print(f"💻 执行命令: {cmd}\n", file=out)
     
     # 记录开始时间
     start_time = datetime.now()
@@ -334,54 +538,41 @@ def run_request(args_str: str, run_index: int, total_runs: int) -> RunResult:
     args_info = parse_args_str(args_str)
     
     try:
-        # 设置环境变量，禁用 Python 的输出缓冲
-        env = os.environ.copy()
-        env['PYTHONUNBUFFERED'] = '1'
-        
         # 运行命令，捕获输出同时显示在终端
+        # 参数按 shell 规则拆分后直接执行，不经过额外的 shell 进程
+        # 以二进制方式读取管道，按块读取并增量解码，避免逐行读取和解码的开销
         process = subprocess.Popen(
-            cmd,
-            shell=True,
+            ["python", "request.py", *shlex.split(args_str)],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            env=env,
+            env=_CHILD_ENV,
         )
         
-        # 实时输出并收集
-        output_lines = []
-        for line in process.stdout:
-            print(line, end='')  # 实时显示
-            sys.stdout.flush()   # 确保立即刷新到屏幕和日志
-            output_lines.append(line)
+        # 实时输出，同时提取关键信息
+        scanner = OutputScanner()
+        stream_output(process, out, scanner)
         
         process.wait()
-        output = ''.join(output_lines)
         
         end_time = datetime.now()
         duration = end_time - start_time
         
         # 检测 STOP_REASON（由 request.py 内部自动停止时打印）
-        stop_match = re.search(r"自动停止原因:\s*(.+)", output)
-        error_msg = None
-        error_key = None
-        if stop_match:
-            error_msg = stop_match.group(1).strip()
-            error_key = "stop_reason"
+        error_msg = scanner.stop_reason
+        error_key = "stop_reason" if error_msg else None
         
-        output_info = parse_output(output)
+        output_info = scanner.result()
         
         success_flag = (process.returncode == 0) and (error_key is None)
         
         if success_flag:
-            print(f"\n✅ 运行 [{run_index}/{total_runs}] 完成 (耗时: {format_duration(duration)})")
+            print(f"\n✅ 运行 [{run_index}/{total_runs}] 完成 (耗时: {format_duration(duration)})", file=out)
         else:
-            print(f"\n❌ 运行 [{run_index}/{total_runs}] 失败")
+            print(f"\n❌ 运行 [{run_index}/{total_runs}] 失败", file=out)
             if process.returncode != 0:
-                print(f"   退出码: {process.returncode}")
+                print(f"   退出码: {process.returncode}", file=out)
             if error_msg:
-                print(f"   检测到错误: {error_msg}")
+                print(f"   检测到错误: {error_msg}", file=out)
         
         return RunResult(
             run_index=run_index,
@@ -409,8 +600,8 @@ def run_request(args_str: str, run_index: int, total_runs: int) -> RunResult:
         end_time = datetime.now()
         duration = end_time - start_time
         
-        print(f"\n❌ 运行 [{run_index}/{total_runs}] 异常")
-        print(f"   错误: {e}")
+        print(f"\n❌ 运行 [{run_index}/{total_runs}] 异常", file=out)
+        print(f"   错误: {e}", file=out)
         
         return RunResult(
             run_index=run_index,
@@ -616,82 +807,92 @@ def print_results_summary(results: List[RunResult], batch_start: datetime, batch
     """打印所有运行结果的详细汇总"""
     batch_duration = batch_end - batch_start
     
-    success_count = sum(1 for r in results if r.success)
-    fail_count = sum(1 for r in results if not r.success)
+    # 一次遍历完成计数和分组
+    successful_results = []
+    failed_results = []
+    for r in results:
+        if r.success:
+            successful_results.append(r)
+        else:
+            failed_results.append(r)
+    success_count = len(successful_results)
+    fail_count = len(failed_results)
+    
+    # 所有行先收集起来，最后一次性输出
+    lines = []
     
-    print(f"\n{'='*100}")
-    print(f"{'='*100}")
-    print(f"📊 批量运行结果汇总")
-    print(f"{'='*100}")
-    print(f"{'='*100}")
+    lines.append(f"\n{'='*100}")
+    lines.append(f"{'='*100}")
+    lines.append(f"📊 批量运行结果汇总")
+    lines.append(f"{'='*100}")
+    lines.append(f"{'='*100}")
     
     # 总体统计
-    print(f"\n📈 总体统计")
-    print(f"{'─'*50}")
-    print(f"  开始时间:     {batch_start.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"  结束时间:     {batch_end.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"  总耗时:       {format_duration(batch_duration)}")
-    print(f"  总运行次数:   {len(results)}")
-    print(f"  成功:         {success_count}")
-    print(f"  失败:         {fail_count}")
+    lines.append(f"\n📈 总体统计")
+    lines.append(f"{'─'*50}")
+    lines.append(f"  开始时间:     {batch_start.strftime('%Y-%m-%d %H:%M:%S')}")
+    lines.append(f"  结束时间:     {batch_end.strftime('%Y-%m-%d %H:%M:%S')}")
+    lines.append(f"  总耗时:       {format_duration(batch_duration)}")
+    lines.append(f"  总运行次数:   {len(results)}")
+    lines.append(f"  成功:         {success_count}")
+    lines.append(f"  失败:         {fail_count}")
     if stop_reason:
-        print(f"  停止原因:     {stop_reason}")
+        lines.append(f"  停止原因:     {stop_reason}")
     
     # 每次运行的详细信息
-    print(f"\n{'='*100}")
-    print(f"📋 各任务详细信息")
-    print(f"{'='*100}")
+    lines.append(f"\n{'='*100}")
+    lines.append(f"📋 各任务详细信息")
+    lines.append(f"{'='*100}")
     
     for r in results:
         status_icon = "✅" if r.success else "❌"
-        print(f"\n{status_icon} 运行 #{r.run_index}")
-        print(f"{'─'*80}")
+        lines.append(f"\n{status_icon} 运行 #{r.run_index}")
+        lines.append(f"{'─'*80}")
         
         # 基本信息
-        print(f"  状态:         {'成功' if r.success else '失败'}")
-        print(f"  耗时:         {format_duration(r.duration)}")
-        print(f"  开始时间:     {r.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"  结束时间:     {r.end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"  状态:         {'成功' if r.success else '失败'}")
+        lines.append(f"  耗时:         {format_duration(r.duration)}")
+        lines.append(f"  开始时间:     {r.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"  结束时间:     {r.end_time.strftime('%Y-%m-%d %H:%M:%S')}")
         
         # 参数信息
-        print(f"\n  📌 请求参数:")
+        lines.append(f"\n  📌 请求参数:")
         if r.provider:
-            print(f"     Provider:    {r.provider}")
+            lines.append(f"     Provider:    {r.provider}")
         if r.model:
-            print(f"     Model:       {r.model}")
+            lines.append(f"     Model:       {r.model}")
         if r.categories:
-            print(f"     Categories:  {r.categories}")
+            lines.append(f"     Categories:  {r.categories}")
         if r.max_tasks_arg:
-            print(f"     Max Tasks:   {r.max_tasks_arg}")
-        print(f"     完整参数:   {r.args_str}")
+            lines.append(f"     Max Tasks:   {r.max_tasks_arg}")
+        lines.append(f"     完整参数:   {r.args_str}")
         
         # 输出信息
         if r.success:
-            print(f"\n  📁 输出文件:")
+            lines.append(f"\n  📁 输出文件:")
             if r.task_num:
-                print(f"     任务编号:   {r.task_num}")
+                lines.append(f"     任务编号:   {r.task_num}")
             if r.total_tasks:
-                print(f"     实际任务数: {r.total_tasks}")
+                lines.append(f"     实际任务数: {r.total_tasks}")
             if r.output_file:
-                print(f"     JSONL 文件: {r.output_file}")
+                lines.append(f"     JSONL 文件: {r.output_file}")
             if r.eval_file:
-                print(f"     评估结果:   {r.eval_file}")
+                lines.append(f"     评估结果:   {r.eval_file}")
             if r.vsp_dir:
-                print(f"     VSP 目录:   {r.vsp_dir}")
+                lines.append(f"     VSP 目录:   {r.vsp_dir}")
         else:
-            print(f"\n  ⚠️ 错误信息:")
-            print(f"     {r.error_message or '未知错误'}")
+            lines.append(f"\n  ⚠️ 错误信息:")
+            lines.append(f"     {r.error_message or '未知错误'}")
     
     # 输出文件汇总表
-    successful_results = [r for r in results if r.success]
     if successful_results:
-        print(f"\n{'='*100}")
-        print(f"📁 输出文件汇总")
-        print(f"{'='*100}")
+        lines.append(f"\n{'='*100}")
+        lines.append(f"📁 输出文件汇总")
+        lines.append(f"{'='*100}")
         
         # 表头
-        print(f"\n  {'#':<4} {'任务编号':<8} {'Provider':<12} {'Model':<35} {'耗时':<12} {'输出文件'}")
-        print(f"  {'─'*4} {'─'*8} {'─'*12} {'─'*35} {'─'*12} {'─'*50}")
+        lines.append(f"\n  {'#':<4} {'任务编号':<8} {'Provider':<12} {'Model':<35} {'耗时':<12} {'输出文件'}")
+        lines.append(f"  {'─'*4} {'─'*8} {'─'*12} {'─'*35} {'─'*12} {'─'*50}")
         
         for r in successful_results:
             task_num_str = str(r.task_num) if r.task_num else "N/A"
@@ -700,23 +901,24 @@ def print_results_summary(results: List[RunResult], batch_start: datetime, batch
             duration_str = format_duration(r.duration) if r.duration else "N/A"
             output_str = r.output_file or "N/A"
             
-            print(f"  {r.run_index:<4} {task_num_str:<8} {provider_str:<12} {model_str:<35} {duration_str:<12} {output_str}")
+            lines.append(f"  {r.run_index:<4} {task_num_str:<8} {provider_str:<12} {model_str:<35} {duration_str:<12} {output_str}")
     
     # 失败任务汇总
-    failed_results = [r for r in results if not r.success]
     if failed_results:
-        print(f"\n{'='*100}")
-        print(f"❌ 失败任务汇总")
-        print(f"{'='*100}")
+        lines.append(f"\n{'='*100}")
+        lines.append(f"❌ 失败任务汇总")
+        lines.append(f"{'='*100}")
         
         for r in failed_results:
-            print(f"\n  运行 #{r.run_index}:")
-            print(f"    参数: {r.args_str}")
-            print(f"    错误: {r.error_message or '未知错误'}")
+            lines.append(f"\n  运行 #{r.run_index}:")
+            lines.append(f"    参数: {r.args_str}")
+            lines.append(f"    错误: {r.error_message or '未知错误'}")
     
-    print(f"\n{'='*100}")
-    print(f"🏁 批量运行完成")
-    print(f"{'='*100}\n")
+    lines.append(f"\n{'='*100}")
+    lines.append(f"🏁 批量运行完成")
+    lines.append(f"{'='*100}\n")
+    
+    print("\n".join(lines))
 
 
 def generate_batch_report(results: List[RunResult], batch_folder: str):
@@ -743,31 +945,19 @@ def generate_batch_report(results: List[RunResult], batch_folder: str):
     print()
     
     try:
-        # 设置环境变量，禁用输出缓冲
-        env = os.environ.copy()
-        env['PYTHONUNBUFFERED'] = '1'
-        
         # 输出到 batch 文件夹
         report_output = os.path.join(batch_folder, "evaluation_report.html")
         
-        # 构建命令，传递指定的评估文件
-        files_arg = ' '.join(f'"{f}"' for f in eval_files)
-        cmd = f'python generate_report_with_charts.py --files {files_arg} --output "{report_output}"'
-        
+        # 构建命令，传递指定的评估文件（列表形式，路径无需加引号）
         process = subprocess.Popen(
-            cmd,
-            shell=True,
+            ["python", "generate_report_with_charts.py", "--files", *eval_files, "--output", report_output],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            env=env,
+            env=_CHILD_ENV,
         )
         
         # 实时输出
-        for line in process.stdout:
-            print(line, end='')
-            sys.stdout.flush()
+        stream_output(process, sys.stdout)
         
         process.wait()
         
@@ -789,6 +979,9 @@ def main():
     # 生成所有参数组合
     combinations = generate_combinations(args_combo)
     total_runs = len(combinations)
+    parallel = max(1, min(PARALLEL, total_runs))
+    if parallel > 1 and not _TASK_NUM_LOCK_AVAILABLE:
+        raise ValueError("当前平台没有 fcntl，无法保证并发运行时任务编号不冲突，请将 PARALLEL 设为 1")
     
     # 确保 output 目录存在
     os.makedirs("output", exist_ok=True)
@@ -811,6 +1004,7 @@ def main():
         print(f"批次编号: {batch_num}")
         print(f"开始时间: {batch_start.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"总运行次数: {total_runs}")
+        print(f"并发数: {parallel}")
         print(f"Batch 文件夹: {batch_folder}")
         print(f"{'='*80}\n")
         
@@ -824,13 +1018,36 @@ def main():
         results: List[RunResult] = []
         stop_reason: Optional[str] = None
         
-        for i, args_str in enumerate(combinations, 1):
-            result = run_request(args_str, i, total_runs)
-            
-            # 将 job 文件夹移动到 batch 文件夹
-            result = move_job_to_batch(result, batch_folder)
+        if parallel == 1:
+            for i, args_str in enumerate(combinations, 1):
+                result = run_request(args_str, i, total_runs)
+                
+                # 将 job 文件夹移动到 batch 文件夹
+                result = move_job_to_batch(result, batch_folder)
+                
+                results.append(result)
+        else:
+            executor = ThreadPoolExecutor(max_workers=parallel)
+            try:
+                futures = [
+                    executor.submit(run_request, args_str, i, total_runs, True)
+                    for i, args_str in enumerate(combinations, 1)
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    
+                    # 将 job 文件夹移动到 batch 文件夹
+                    result = move_job_to_batch(result, batch_folder)
+                    
+                    results.append(result)
+            except BaseException:
+                # Ctrl-C 等中断时取消还没开始的运行，不再等它们逐个启动 request.py
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
             
-            results.append(result)
+            # 并发完成顺序不确定，按运行序号排序
+            results.sort(key=lambda r: r.run_index)
         
         # 记录结束时间
         batch_end = datetime.now()
@@ -869,6 +1086,9 @@ def main():
         close_logging()
         print(f"\n❌ 批量运行发生异常: {e}")
         raise
+    finally:
+        # Ctrl-C（KeyboardInterrupt）等不属于 Exception 的中断也要写出日志缓冲并关闭文件
+        close_logging()
 
 
 if __name__ == "__main__":
@@ -4,135 +4,316 @@
 """
 
 import os
-import re
-from pathlib import Path
-from collections import defaultdict
+import json
+import mmap
+import tempfile
+from contextlib import contextmanager
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
 
-def extract_result_section(log_content: str) -> str:
+# log 中的标记（bytes，直接在内存映射上搜索，无需解码整个文件）
+_B_RESULT = b"# RESULT #:"
+_B_ATTENTION = b"ATTENTION! YOUR ACTUAL TASK BEGINS HERE"
+_B_USER_REQUEST = b"# USER REQUEST #:"
+_B_TOOL_USED = b"[VSP_TOOL_USED]"
+_B_PYTHON_BLOCK = b"```python"
+
+LogBuffer = Union[bytes, mmap.mmap]
+
+# 分析结果缓存：{绝对路径: [mtime_ns, size, has_result, used_vsp_tools, used_code, has_user_request]}
+# 文件的 mtime 和大小都未变化时直接复用上次的检测结果
+# 固定放在项目的 output 目录下，不随运行时的当前目录变化
+VSP_SCAN_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output", ".vsp_scan_cache.json")
+
+# 写示例文件时的缓冲区大小（示例可能有数 MB，用大缓冲区减少 write 系统调用）
+EXAMPLE_WRITE_BUFFER_SIZE = 1 << 20
+
+# RESULT 部分中需要检测的标记（结果字段名 -> 标记），新增标记只需在此登记
+_RESULT_MARKERS = {
+    "used_vsp_tools": _B_TOOL_USED,
+    "used_code": _B_PYTHON_BLOCK,
+}
+
+@contextmanager
+def open_log(log_file: str):
     """
-    提取 LLM 的实际回复部分（模型的实际输出）
+    以只读内存映射打开 log 文件，由操作系统页缓存负责读取
+    
+    映射上的 rfind 从文件末尾向前扫描，只会读入最后一个标记之后的页面，
+    等价于从尾部按块倒序读取，无需单独实现分块读取。
+    
+    空文件无法映射，直接返回 b""
+    """
+    with open(log_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+def extract_result_section(log_content: LogBuffer) -> int:
+    """
+    定位 LLM 的实际回复部分（模型的实际输出）
     
     处理两种格式的 log：
     1. 新格式（有 'ATTENTION! YOUR ACTUAL TASK BEGINS HERE' 标记）：
        在该标记之后找 '# RESULT #:' 
     2. 旧格式（没有该标记）：
        使用最后一个 '# RESULT #:' 之后的内容
-    """
-    result_marker = "# RESULT #:"
-    attention_marker = "ATTENTION! YOUR ACTUAL TASK BEGINS HERE"
     
+    只返回起始偏移量而不切片，避免为大 log 复制一份子串。
+    
+    Returns:
+        RESULT 部分在 log_content 中的起始偏移量，未找到返回 -1
+    """
     # 检查是否有新格式的标记
-    attention_idx = log_content.rfind(attention_marker)
+    attention_idx = log_content.rfind(_B_ATTENTION)
     
     if attention_idx != -1:
         # 新格式：在 ATTENTION 标记之后找 RESULT
-        content_after_attention = log_content[attention_idx:]
-        result_idx = content_after_attention.find(result_marker)
-        
-        if result_idx == -1:
-            return ""
-        
-        # 返回 ATTENTION 之后的 RESULT 部分
-        return content_after_attention[result_idx:]
+        return log_content.find(_B_RESULT, attention_idx)
     else:
         # 旧格式：使用最后一个 RESULT
-        last_result_idx = log_content.rfind(result_marker)
-        
-        if last_result_idx == -1:
-            return ""
-        
-        # 返回最后一个 RESULT 之后的内容
-        return log_content[last_result_idx:]
+        return log_content.rfind(_B_RESULT)
 
-def check_tool_usage(result_section: str) -> bool:
+def check_tool_usage(log_content: LogBuffer, start: int) -> bool:
     """
     检查是否使用了 VSP 工具
     
-    判断标准：在 # RESULT #: 之后是否包含 [VSP_TOOL_USED] 标记
+    判断标准：在 # RESULT #: 之后（从 start 开始）是否包含 [VSP_TOOL_USED] 标记
     
     这个标记由 tools.py 中的工具函数在实际执行时输出，
     确保检测的是真正的 VSP 工具调用，而不是 LLM 自己编写的通用 Python 代码。
     """
-    if not result_section:
+    if start == -1:
         return False
     
     # 查找 [VSP_TOOL_USED] 标记
     # 这个标记只有在工具函数真正被调用时才会出现
-    return '[VSP_TOOL_USED]' in result_section
+    return log_content.find(_B_TOOL_USED, start) != -1
 
-def check_code_usage(result_section: str) -> bool:
+def check_code_usage(log_content: LogBuffer, start: int) -> bool:
     """
     检查是否使用了代码
     
-    判断标准：在 # RESULT #: 之后是否包含 ```python 代码块
+    判断标准：在 # RESULT #: 之后（从 start 开始）是否包含 ```python 代码块
     
     这表示 LLM 生成了 Python 代码来解决问题。
     """
-    if not result_section:
+    if start == -1:
         return False
     
     # 查找 ```python 代码块
-    return '```python' in result_section
+    return log_content.find(_B_PYTHON_BLOCK, start) != -1
 
-def extract_user_interaction(log_content: str) -> str:
+def scan_result_markers(log_content: LogBuffer, start: int) -> dict:
     """
-    提取用户交互部分（去掉 VSP 的通用示例文本）
+    一次性检测 RESULT 部分（从 start 开始）中登记的所有标记
     
-    返回最后一个 "# USER REQUEST #:" 之后的所有内容
+    Returns:
+        {结果字段名: 是否出现}，例如 {"used_vsp_tools": True, "used_code": True}
     """
-    user_request_marker = "# USER REQUEST #:"
-    last_user_request_idx = log_content.rfind(user_request_marker)
+    if start == -1:
+        return {key: False for key in _RESULT_MARKERS}
     
-    if last_user_request_idx == -1:
-        return ""
+    return {key: log_content.find(marker, start) != -1 for key, marker in _RESULT_MARKERS.items()}
+
+def decode_tail(log_content: LogBuffer, start: int) -> str:
+    """
+    把 log 从 start 到末尾的部分解码为文本
     
-    return log_content[last_user_request_idx:]
+    通过 memoryview 直接在映射上解码，不先复制出一份 bytes 切片
+    """
+    with memoryview(log_content) as view, view[start:] as tail:
+        return str(tail, 'utf-8', errors='replace')
 
-def save_examples_to_files(examples_with_content: dict, output_dir: str = "output"):
+def extract_user_interaction(log_content: LogBuffer) -> int:
+    """
+    定位用户交互部分（去掉 VSP 的通用示例文本）
+    
+    Returns:
+        最后一个 "# USER REQUEST #:" 的偏移量，未找到返回 -1
+    """
+    return log_content.rfind(_B_USER_REQUEST)
+
+def _write_examples(f, title: str, files: list):
+    """
+    把一组示例逐个写入文件
+    
+    每次只读取一个 log 的用户交互部分并立即写出，内存占用与 max_examples 无关。
+    示例在统计阶段已确认含有用户交互部分；若之后读取失败（如文件被删除），写入占位说明，
+    保持编号与总数一致。
+    """
+    total = len(files)
+    f.writelines(["=" * 80 + "\n", f"{title}（共 {total} 个）\n", "=" * 80 + "\n\n"])
+    
+    for i, path in enumerate(files, 1):
+        content = _load_user_interaction(path)
+        f.writelines([
+            f"\n{'='*80}\n示例 {i}/{total}\n文件: {path}\n{'='*80}\n\n",
+            content if content else "（读取失败）",
+            "\n\n",
+        ])
+
+def save_examples_to_files(example_files: dict, output_dir: str = "output"):
     """
     保存示例到文件
     
     Args:
-        examples_with_content: {"used_tools": [(path, content), ...], "no_tools": [(path, content), ...]}
+        example_files: {"used_tools": [path, ...], "no_tools": [path, ...]}，被选为示例的 log 路径
         output_dir: 输出目录
     """
     os.makedirs(output_dir, exist_ok=True)
     
     # 保存使用了工具的示例
     used_tools_file = os.path.join(output_dir, "vsp_examples_used_tools.txt")
-    with open(used_tools_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("VSP 使用工具的示例（共 {} 个）\n".format(len(examples_with_content['used_tools'])))
-        f.write("=" * 80 + "\n\n")
-        
-        for i, (path, content) in enumerate(examples_with_content['used_tools'], 1):
-            f.write(f"\n{'='*80}\n")
-            f.write(f"示例 {i}/{len(examples_with_content['used_tools'])}\n")
-            f.write(f"文件: {path}\n")
-            f.write(f"{'='*80}\n\n")
-            f.write(content)
-            f.write("\n\n")
+    with open(used_tools_file, 'w', encoding='utf-8', buffering=EXAMPLE_WRITE_BUFFER_SIZE) as f:
+        _write_examples(f, "VSP 使用工具的示例", example_files['used_tools'])
     
     # 保存未使用工具的示例
     no_tools_file = os.path.join(output_dir, "vsp_examples_no_tools.txt")
-    with open(no_tools_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("VSP 未使用工具的示例（共 {} 个）\n".format(len(examples_with_content['no_tools'])))
-        f.write("=" * 80 + "\n\n")
-        
-        for i, (path, content) in enumerate(examples_with_content['no_tools'], 1):
-            f.write(f"\n{'='*80}\n")
-            f.write(f"示例 {i}/{len(examples_with_content['no_tools'])}\n")
-            f.write(f"文件: {path}\n")
-            f.write(f"{'='*80}\n\n")
-            f.write(content)
-            f.write("\n\n")
+    with open(no_tools_file, 'w', encoding='utf-8', buffering=EXAMPLE_WRITE_BUFFER_SIZE) as f:
+        _write_examples(f, "VSP 未使用工具的示例", example_files['no_tools'])
     
     print(f"\n✅ 示例已保存:")
     print(f"   - 使用工具: {used_tools_file}")
     print(f"   - 未使用工具: {no_tools_file}")
 
-def analyze_vsp_logs(vsp_details_dir: str, summarize_examples: bool = False, max_examples: int = 100):
+def _iter_debug_logs(root: str):
+    """
+    遍历目录树，逐个产出 vsp_debug.log 的路径（str）
+    
+    os.walk 在 C 层用 scandir 遍历目录，不为每个文件构造 Path 对象，
+    遍历顺序与 rglob 相同（先序）。
+    """
+    for dirpath, _, filenames in os.walk(root):
+        if "vsp_debug.log" in filenames:
+            yield os.path.join(dirpath, "vsp_debug.log")
+
+def load_scan_cache() -> dict:
+    """读取分析结果缓存，不存在或损坏时返回空字典"""
+    try:
+        with open(VSP_SCAN_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except OSError:
+        return {}
+    except ValueError:
+        print(f"⚠️  分析缓存已损坏，将重新分析所有文件: {VSP_SCAN_CACHE_FILE}")
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def save_scan_cache(cache: dict):
+    """
+    保存分析结果缓存
+    
+    先写入同目录下的临时文件再用 os.replace 替换，写入中途出错不会留下损坏的缓存文件
+    """
+    cache_dir = os.path.dirname(VSP_SCAN_CACHE_FILE)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".vsp_scan_cache.", suffix=".tmp", dir=cache_dir)
+        with open(fd, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, VSP_SCAN_CACHE_FILE)
+    except OSError as e:
+        print(f"⚠️  保存分析缓存失败: {e}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _analyze_one(log_file: str, cached: Optional[list] = None) -> dict:
+    """
+    分析单个 vsp_debug.log（在工作进程中运行）
+    
+    只做分类，不返回 log 内容；示例内容在汇总后按需另行读取（见 _load_user_interaction）。
+    
+    Args:
+        log_file: vsp_debug.log 路径
+        cached: 该文件上次的缓存条目（见 VSP_SCAN_CACHE_FILE）
+        
+    Returns:
+        分析结果字典，error 不为 None 表示读取失败；
+        cache_entry 为本次结果对应的缓存条目
+    """
+    # 从路径中提取 category 和 index
+    # 路径格式: .../vsp_TIMESTAMP/CATEGORY/INDEX/output/vsp_debug.log
+    parts = log_file.rsplit(os.sep, 4)
+    try:
+        category_idx = -4  # output 的上上上级是 category
+        category = parts[category_idx]
+        index = parts[category_idx + 1]
+    except IndexError:
+        category = "Unknown"
+        index = "Unknown"
+    
+    result = {
+        "path": log_file,
+        "category": category,
+        "index": index,
+        "error": None,
+        "has_result": False,
+        "used_vsp_tools": False,
+        "used_code": False,
+        "has_user_request": False,
+        "cache_entry": None,
+    }
+    
+    try:
+        st = os.stat(log_file)
+    except OSError as e:
+        result["error"] = str(e)
+        return result
+    
+    # 命中缓存：文件未变化，直接复用上次的检测结果
+    if cached and len(cached) == 6 and cached[:2] == [st.st_mtime_ns, st.st_size]:
+        _, _, has_result, used_vsp_tools, used_code, has_user_request = cached
+        result.update(has_result=has_result, used_vsp_tools=used_vsp_tools, used_code=used_code,
+                      has_user_request=has_user_request)
+        result["cache_entry"] = cached
+        return result
+    
+    try:
+        with open_log(log_file) as log_content:
+            _classify_log(log_content, result)
+    except (OSError, ValueError) as e:
+        result["error"] = str(e)
+        return result
+    
+    result["cache_entry"] = [st.st_mtime_ns, st.st_size, result["has_result"],
+                             result["used_vsp_tools"], result["used_code"], result["has_user_request"]]
+    return result
+
+def _classify_log(log_content: LogBuffer, result: dict):
+    """在 log 内容上做检测，结果写入 result"""
+    # 定位 RESULT 部分
+    result_start = extract_result_section(log_content)
+    
+    if result_start == -1:
+        return
+    
+    result["has_result"] = True
+    
+    # 检查是否使用了 VSP 工具 / 代码
+    result.update(scan_result_markers(log_content, result_start))
+    
+    # 记录是否有用户交互部分（决定该文件能否作为示例）
+    if result["used_vsp_tools"] or result["used_code"]:
+        result["has_user_request"] = extract_user_interaction(log_content) != -1
+
+def _load_user_interaction(log_file: str) -> Optional[str]:
+    """读取单个 log 的用户交互部分（用于保存示例），失败返回 None"""
+    try:
+        with open_log(log_file) as log_content:
+            user_start = extract_user_interaction(log_content)
+            if user_start == -1:
+                return None
+            return decode_tail(log_content, user_start)
+    except (OSError, ValueError):
+        return None
+
+def analyze_vsp_logs(vsp_details_dir: str, summarize_examples: bool = False, max_examples: int = 100,
+                     max_workers: Optional[int] = None, use_cache: bool = True):
     """
     分析所有 VSP debug log
     
@@ -140,16 +321,17 @@ def analyze_vsp_logs(vsp_details_dir: str, summarize_examples: bool = False, max
         vsp_details_dir: VSP 详细输出目录
         summarize_examples: 是否保存示例到文件
         max_examples: 每种类型最多收集多少个示例
+        max_workers: 并行分析的进程数（默认: CPU 核数）
+        use_cache: 是否复用未变化文件的上次分析结果；本目录下的缓存条目按本次扫描结果更新，
+                   其他目录的条目保留（文件已删除的除外），内容没有变化时不重写缓存文件
     """
     
-    vsp_details_path = Path(vsp_details_dir)
-    
-    if not vsp_details_path.exists():
+    if not os.path.exists(vsp_details_dir):
         print(f"❌ 目录不存在: {vsp_details_dir}")
         return
     
     # 查找所有 vsp_debug.log 文件
-    log_files = list(vsp_details_path.rglob("vsp_debug.log"))
+    log_files = list(_iter_debug_logs(vsp_details_dir))
     
     print(f"📂 找到 {len(log_files)} 个 VSP debug log 文件\n")
     
@@ -165,12 +347,10 @@ def analyze_vsp_logs(vsp_details_dir: str, summarize_examples: bool = False, max
         "no_result_section": 0,
     }
     
-    # 按 category 分组统计
-    category_stats = defaultdict(lambda: {
-        "used_vsp_tools": 0,
-        "used_code": 0,
-        "total": 0
-    })
+    # 按 category 分组统计（每个指标一个 Counter，每条 log 只做一次计数）
+    category_total = Counter()
+    category_vsp = Counter()
+    category_code = Counter()
     
     # 示例文件（用于调试）
     examples = {
@@ -178,73 +358,78 @@ def analyze_vsp_logs(vsp_details_dir: str, summarize_examples: bool = False, max
         "no_tools": []
     }
     
-    # 示例内容（用于保存到文件）
-    examples_with_content = {
+    # 选为示例的文件（用于保存到文件），保存时再逐个读取内容
+    example_files = {
         "used_tools": [],
         "no_tools": []
     }
     
-    for log_file in log_files:
-        stats["total"] += 1
-        
-        # 从路径中提取 category 和 index
-        # 路径格式: .../vsp_TIMESTAMP/CATEGORY/INDEX/output/vsp_debug.log
-        parts = log_file.parts
-        try:
-            category_idx = -4  # output 的上上上级是 category
-            category = parts[category_idx]
-            index = parts[category_idx + 1]
-        except IndexError:
-            category = "Unknown"
-            index = "Unknown"
-        
-        # 读取文件内容
-        try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                log_content = f.read()
-        except Exception as e:
-            print(f"❌ 读取文件失败: {log_file} - {e}")
-            continue
-        
-        # 提取 RESULT 部分
-        result_section = extract_result_section(log_content)
-        
-        if not result_section:
-            stats["no_result_section"] += 1
-            continue
-        
-        # 检查是否使用了 VSP 工具
-        used_vsp_tools = check_tool_usage(result_section)
-        
-        # 检查是否使用了代码
-        used_code = check_code_usage(result_section)
+    cache = load_scan_cache() if use_cache else {}
+    cache_keys = [os.path.abspath(p) for p in log_files]
+    # 其他目录的缓存条目原样保留，只去掉文件已被删除的（如被 cleanup_output.py 清理的 job）；
+    # 本目录下的条目由本次扫描的结果重新填充
+    scan_root = os.path.join(os.path.abspath(vsp_details_dir), "")
+    new_cache = {
+        key: entry for key, entry in cache.items()
+        if not key.startswith(scan_root) and os.path.exists(key)
+    }
+    
+    # 每个文件的分析相互独立，分发到多个进程并行处理，主进程只负责汇总
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            _analyze_one,
+            log_files,
+            [cache.get(key) for key in cache_keys],
+            chunksize=32,
+        )
         
-        # VSP 工具和代码使用独立统计
-        if used_vsp_tools:
-            stats["used_vsp_tools"] += 1
-            category_stats[category]["used_vsp_tools"] += 1
-            if len(examples["used_tools"]) < 3:
-                examples["used_tools"].append(str(log_file))
+        for cache_key, r in zip(cache_keys, results):
+            stats["total"] += 1
+            log_file = r["path"]
+            category = r["category"]
             
-            # 如果需要保存示例，收集内容
-            if summarize_examples and len(examples_with_content["used_tools"]) < max_examples:
-                user_interaction = extract_user_interaction(log_content)
-                if user_interaction:
-                    examples_with_content["used_tools"].append((str(log_file), user_interaction))
-        
-        if used_code:
-            stats["used_code"] += 1
-            category_stats[category]["used_code"] += 1
-            if len(examples["no_tools"]) < 3 and not used_vsp_tools:
-                examples["no_tools"].append(str(log_file))
+            if r["cache_entry"] is not None:
+                new_cache[cache_key] = r["cache_entry"]
             
-            # 如果需要保存示例，收集内容
-            if summarize_examples and len(examples_with_content["no_tools"]) < max_examples and not used_vsp_tools:
-                user_interaction = extract_user_interaction(log_content)
-                if user_interaction:
-                    examples_with_content["no_tools"].append((str(log_file), user_interaction))
-        
-        category_stats[category]["total"] += 1
+            if r["error"] is not None:
+                print(f"❌ 读取文件失败: {log_file} - {r['error']}")
+                continue
+            
+            if not r["has_result"]:
+                stats["no_result_section"] += 1
+                continue
+            
+            used_vsp_tools = r["used_vsp_tools"]
+            used_code = r["used_code"]
+            has_user_request = r["has_user_request"]
+            
+            # VSP 工具和代码使用独立统计
+            if used_vsp_tools:
+                stats["used_vsp_tools"] += 1
+                category_vsp[category] += 1
+                if len(examples["used_tools"]) < 3:
+                    examples["used_tools"].append(log_file)
+                
+                # 如果需要保存示例，记录该文件
+                if summarize_examples and len(example_files["used_tools"]) < max_examples:
+                    if has_user_request:
+                        example_files["used_tools"].append(log_file)
+            
+            if used_code:
+                stats["used_code"] += 1
+                category_code[category] += 1
+                if len(examples["no_tools"]) < 3 and not used_vsp_tools:
+                    examples["no_tools"].append(log_file)
+                
+                # 如果需要保存示例，记录该文件
+                if summarize_examples and len(example_files["no_tools"]) < max_examples and not used_vsp_tools:
+                    if has_user_request:
+                        example_files["no_tools"].append(log_file)
+            
+            category_total[category] += 1
+    
+    if use_cache and new_cache != cache:
+        save_scan_cache(new_cache)
     
     # 打印统计结果
     print(f"{'='*80}")
@@ -264,11 +449,10 @@ def analyze_vsp_logs(vsp_details_dir: str, summarize_examples: bool = False, max
     print(f"{'类别':<30} {'总数':<8} {'VSP工具':<10} {'代码':<10} {'VSP使用率':<12} {'代码使用率':<12}")
     print(f"{'-'*80}")
     
-    for category in sorted(category_stats.keys()):
-        cat_data = category_stats[category]
-        total = cat_data["total"]
-        used_vsp = cat_data["used_vsp_tools"]
-        used_code = cat_data["used_code"]
+    for category in sorted(category_total):
+        total = category_total[category]
+        used_vsp = category_vsp[category]
+        used_code = category_code[category]
         vsp_rate = used_vsp / total * 100 if total > 0 else 0
         code_rate = used_code / total * 100 if total > 0 else 0
         print(f"{category:<30} {total:<8} {used_vsp:<10} {used_code:<10} {vsp_rate:.1f}%         {code_rate:.1f}%")
@@ -291,7 +475,7 @@ def analyze_vsp_logs(vsp_details_dir: str, summarize_examples: bool = False, max
         print(f"\n{'='*80}")
         print(f"💾 保存示例到文件")
         print(f"{'='*80}")
-        save_examples_to_files(examples_with_content)
+        save_examples_to_files(example_files)
 
 if __name__ == "__main__":
     import argparse
@@ -337,10 +521,24 @@ if __name__ == "__main__":
         help="每种类型最多收集多少个示例（默认: 100）"
     )
     
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help=f"不使用分析结果缓存，重新分析所有文件（缓存文件: {VSP_SCAN_CACHE_FILE}）"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="并行分析的进程数（默认: CPU 核数）"
+    )
+    
     args = parser.parse_args()
     
     # 展开用户路径（支持 ~ 符号）
     vsp_details_dir = os.path.expanduser(args.dir)
     
-    analyze_vsp_logs(vsp_details_dir, summarize_examples=args.summarize_examples, max_examples=args.max_examples)
+    analyze_vsp_logs(vsp_details_dir, summarize_examples=args.summarize_examples, max_examples=args.max_examples,
+                     max_workers=args.workers, use_cache=not args.no_cache)
 
@@ -20,16 +20,25 @@
     
     # 自动确认删除（不需要交互）
     python cleanup_output.py --yes
+    
+    # 预览时不计算文件夹大小（job 文件夹很多时更快）
+    python cleanup_output.py --dry-run --no-size
 """
 
 import os
 import re
-import glob
+import sys
+import shutil
 import argparse
-from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Optional
+
 
+# job 文件夹名格式: job_{num}_tasks_{total}_{Provider}_{model}_{timestamp}
+_JOB_RE = re.compile(r'^job_(\d+)_tasks_(\d+)_([^_]+)_(.+)_(\d{4}_\d{6})$')
 
-def parse_job_folder_name(folder_name: str) -> Tuple[int, int, str, str, str]:
+
+def parse_job_folder_name(folder_name: str) -> Optional[Tuple[int, int, str, str, str]]:
     """
     从 job 文件夹名称中提取信息
     
@@ -37,20 +46,33 @@ def parse_job_folder_name(folder_name: str) -> Tuple[int, int, str, str, str]:
     例如: job_104_tasks_202_ComtVsp_qwen3-vl-8b_0104_193618
     
     Returns:
-        (job_num, task_count, provider, model, timestamp) 或 (None, None, None, None, None) 如果无法解析
+        (job_num, task_count, provider, model, timestamp)，无法解析时返回 None
+    """
+    match = _JOB_RE.match(folder_name)
+    
+    if match is None:
+        return None
+    
+    job_num, task_count, provider, model, timestamp = match.groups()
+    return int(job_num), int(task_count), provider, model, timestamp
+
+
+def iter_job_dirs(output_dir: str):
     """
-    pattern = r'^job_(\d+)_tasks_(\d+)_([^_]+)_(.+)_(\d{4}_\d{6})$'
-    match = re.match(pattern, folder_name)
-    
-    if match:
-        job_num = int(match.group(1))
-        task_count = int(match.group(2))
-        provider = match.group(3)
-        model = match.group(4)
-        timestamp = match.group(5)
-        return job_num, task_count, provider, model, timestamp
-    
-    return None, None, None, None, None
+    遍历 output 目录下所有 job_ 开头的子目录
+    
+    单次 os.scandir，直接使用目录项自带的类型信息，无需额外 stat
+    
+    Yields:
+        (folder_name, folder_path)
+    """
+    try:
+        with os.scandir(output_dir) as it:
+            for entry in it:
+                if entry.name.startswith('job_') and entry.is_dir(follow_symlinks=False):
+                    yield entry.name, entry.path
+    except OSError:
+        return
 
 
 def find_job_folders_to_cleanup(output_dir: str = 'output', threshold: int = 100) -> Dict[str, Dict]:
@@ -62,26 +84,21 @@ def find_job_folders_to_cleanup(output_dir: str = 'output', threshold: int = 100
         threshold: 任务数阈值，小于此值的 job 将被清理
     
     Returns:
-        {folder_name: {job_num, task_count, provider, model, timestamp, path, size}}
+        {folder_name: {job_num, task_count, provider, model, timestamp, path}}
     """
     cleanup_candidates = {}
     
-    # 查找所有 job_ 开头的目录
-    job_folders = glob.glob(os.path.join(output_dir, 'job_*'))
-    
-    for folder_path in job_folders:
-        if not os.path.isdir(folder_path):
-            continue
-        
-        folder_name = os.path.basename(folder_path)
-        
+    # 遍历所有 job_ 开头的目录
+    for folder_name, folder_path in iter_job_dirs(output_dir):
         # 解析文件夹名
-        job_num, task_count, provider, model, timestamp = parse_job_folder_name(folder_name)
+        parsed = parse_job_folder_name(folder_name)
         
-        if job_num is None or task_count is None:
+        if parsed is None:
             # 无法解析的文件夹名，跳过
             continue
         
+        job_num, task_count, provider, model, timestamp = parsed
+        
         # 检查是否低于阈值
         if task_count < threshold:
             cleanup_candidates[folder_name] = {
@@ -91,7 +108,6 @@ def find_job_folders_to_cleanup(output_dir: str = 'output', threshold: int = 100
                 'model': model,
                 'timestamp': timestamp,
                 'path': folder_path,
-                'size': get_dir_size(folder_path)
             }
     
     return cleanup_candidates
@@ -106,7 +122,7 @@ def find_job_folders_by_job_num(output_dir: str = 'output', job_nums: List[int]
         job_nums: 要查找的任务编号列表
     
     Returns:
-        {folder_name: {job_num, task_count, provider, model, timestamp, path, size}}
+        {folder_name: {job_num, task_count, provider, model, timestamp, path}}
     """
     if job_nums is None:
         job_nums = []
@@ -114,22 +130,17 @@ def find_job_folders_by_job_num(output_dir: str = 'output', job_nums: List[int]
     cleanup_candidates = {}
     job_nums_set = set(job_nums)
     
-    # 查找所有 job_ 开头的目录
-    job_folders = glob.glob(os.path.join(output_dir, 'job_*'))
-    
-    for folder_path in job_folders:
-        if not os.path.isdir(folder_path):
-            continue
-        
-        folder_name = os.path.basename(folder_path)
-        
+    # 遍历所有 job_ 开头的目录
+    for folder_name, folder_path in iter_job_dirs(output_dir):
         # 解析文件夹名
-        job_num, task_count, provider, model, timestamp = parse_job_folder_name(folder_name)
+        parsed = parse_job_folder_name(folder_name)
         
-        if job_num is None:
+        if parsed is None:
             # 无法解析的文件夹名，跳过
             continue
         
+        job_num, task_count, provider, model, timestamp = parsed
+        
         # 检查是否是要删除的任务编号
         if job_num in job_nums_set:
             cleanup_candidates[folder_name] = {
@@ -139,7 +150,6 @@ def find_job_folders_by_job_num(output_dir: str = 'output', job_nums: List[int]
                 'model': model,
                 'timestamp': timestamp,
                 'path': folder_path,
-                'size': get_dir_size(folder_path)
             }
     
     return cleanup_candidates
@@ -155,87 +165,135 @@ def format_file_size(size_bytes: int) -> str:
 
 
 def get_dir_size(path: str) -> int:
-    """获取目录的总大小"""
+    """
+    获取目录的总大小
+    
+    使用 os.scandir 递归遍历，DirEntry 自带类型信息且缓存 stat 结果，
+    比 os.walk + os.path.getsize 少一半系统调用
+    """
     total = 0
-    if os.path.isdir(path):
-        for dirpath, dirnames, filenames in os.walk(path):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
                 try:
-                    total += os.path.getsize(filepath)
+                    if entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                    elif entry.is_dir(follow_symlinks=False):
+                        total += get_dir_size(entry.path)
                 except OSError:
                     pass
+    except OSError:
+        pass
     return total
 
 
-def print_cleanup_summary(cleanup_candidates: Dict[str, Dict]):
-    """打印清理摘要"""
+def list_folder_contents(folder_path: str) -> List[str]:
+    """
+    列出文件夹的直接子项，格式为 "[DIR]  name" / "[FILE] name"
+    
+    单次 os.scandir，用目录项自带的类型判断目录，不再对每一项单独 stat；
+    文件夹不存在或无法读取时返回空列表
+    """
+    contents = []
+    try:
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                contents.append(f"[DIR]  {entry.name}" if is_dir else f"[FILE] {entry.name}")
+    except OSError:
+        pass
+    return contents
+
+
+def print_cleanup_summary(cleanup_candidates: Dict[str, Dict], show_size: bool = True, max_workers: int = 8):
+    """
+    打印清理摘要
+    
+    Args:
+        cleanup_candidates: 待清理的 job 文件夹
+        show_size: 是否计算并显示文件夹大小（需要递归遍历每个文件夹）
+        max_workers: 并发计算文件夹大小的线程数
+    """
     if not cleanup_candidates:
         print("\n✅ 没有找到需要清理的 job 文件夹")
         return
     
-    print(f"\n{'='*80}")
-    print(f"🗑️  清理摘要")
-    print(f"{'='*80}\n")
-    
     total_size = 0
+    sorted_candidates = sorted(cleanup_candidates.items(), key=lambda x: x[1]['job_num'])
+    
+    # 计算大小主要耗时在 stat 系统调用上，各文件夹用线程并发遍历
+    sizes = [None] * len(sorted_candidates)
+    if show_size:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            sizes = list(executor.map(get_dir_size, [info['path'] for _, info in sorted_candidates]))
     
-    for i, (folder_name, info) in enumerate(sorted(cleanup_candidates.items(), key=lambda x: x[1]['job_num']), 1):
+    # 先收集所有行，最后一次性输出（候选很多时避免逐行 print）
+    lines = []
+    lines.append(f"\n{'='*80}")
+    lines.append(f"🗑️  清理摘要")
+    lines.append(f"{'='*80}\n")
+    
+    for i, ((folder_name, info), size) in enumerate(zip(sorted_candidates, sizes), 1):
         job_num = info['job_num']
         task_count = info['task_count']
         provider = info['provider']
         model = info['model']
         timestamp = info['timestamp']
-        size = info['size']
         
-        print(f"{i}. Job {job_num} (tasks={task_count})")
-        print(f"   文件夹: {folder_name}")
-        print(f"   Provider: {provider}")
-        print(f"   Model: {model}")
-        print(f"   Timestamp: {timestamp}")
-        print(f"   大小: {format_file_size(size)}")
+        lines.append(f"{i}. Job {job_num} (tasks={task_count})")
+        lines.append(f"   文件夹: {folder_name}")
+        lines.append(f"   Provider: {provider}")
+        lines.append(f"   Model: {model}")
+        lines.append(f"   Timestamp: {timestamp}")
+        
+        if show_size:
+            total_size += size
+            lines.append(f"   大小: {format_file_size(size)}")
         
         # 列出文件夹内容
-        folder_path = info['path']
-        if os.path.exists(folder_path):
-            contents = []
-            for item in os.listdir(folder_path):
-                item_path = os.path.join(folder_path, item)
-                if os.path.isdir(item_path):
-                    contents.append(f"[DIR]  {item}")
-                else:
-                    contents.append(f"[FILE] {item}")
-            
-            if contents:
-                print(f"   内容:")
-                for content in sorted(contents):
-                    print(f"     └─ {content}")
+        contents = list_folder_contents(info['path'])
+        if contents:
+            lines.append(f"   内容:")
+            for content in sorted(contents):
+                lines.append(f"     └─ {content}")
         
-        total_size += size
-        print()
+        lines.append("")
     
-    print(f"{'='*80}")
-    print(f"总计: {len(cleanup_candidates)} 个 job 文件夹")
-    print(f"将释放空间: {format_file_size(total_size)}")
-    print(f"{'='*80}\n")
+    lines.append(f"{'='*80}")
+    lines.append(f"总计: {len(cleanup_candidates)} 个 job 文件夹")
+    if show_size:
+        lines.append(f"将释放空间: {format_file_size(total_size)}")
+    lines.append(f"{'='*80}\n")
+    
+    print("\n".join(lines))
 
 
-def delete_job_folder(folder_path: str) -> bool:
+def delete_job_folder(folder_path: str) -> Tuple[bool, Optional[str]]:
     """
     删除 job 文件夹
     
+    遇到无法删除的文件时记录错误并继续删除其余内容
+    
     Returns:
-        True if successful, False otherwise
+        (是否成功, 错误信息)
     """
-    import shutil
+    errors = []
     
-    try:
-        shutil.rmtree(folder_path)
-        print(f"  ✅ 已删除: {folder_path}")
-        return True
-    except Exception as e:
-        print(f"  ❌ 删除失败 {folder_path}: {e}")
-        return False
+    def _log_exc(func, path, exc):
+        errors.append(f"{path}: {exc}")
+    
+    # Python 3.12 起 onerror 已弃用，改用 onexc（回调直接收到异常对象）
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(folder_path, onexc=_log_exc)
+    else:
+        shutil.rmtree(folder_path, onerror=lambda func, path, exc_info: _log_exc(func, path, exc_info[1]))
+    
+    if errors:
+        return False, "; ".join(errors)
+    return True, None
 
 
 def main():
@@ -261,6 +319,9 @@ def main():
   
   # 自动确认删除（不需要交互）
   python cleanup_output.py --yes
+  
+  # 预览时不计算文件夹大小（job 文件夹很多时更快）
+  python cleanup_output.py --dry-run --no-size
         """
     )
     
@@ -274,9 +335,16 @@ def main():
                        help='预览模式：只显示将要删除的文件，不实际删除')
     parser.add_argument('--yes', '-y', action='store_true',
                        help='自动确认，不需要交互式询问')
+    parser.add_argument('--no-size', action='store_true',
+                       help='不计算文件夹大小（跳过对每个文件夹的递归遍历）')
+    parser.add_argument('--workers', type=int, default=8,
+                       help='计算文件夹大小和删除时的并发线程数（默认: 8）')
     
     args = parser.parse_args()
     
+    # 线程数小于 1 时退化为单线程（与 generate_report_with_charts.py 的 --workers 一致）
+    args.workers = max(1, args.workers)
+    
     # 检查互斥参数
     if args.job_num and args.threshold != 100:
         print("❌ 错误: --job-num 和 --threshold 不能同时使用")
@@ -310,7 +378,7 @@ def main():
         return
     
     # 打印摘要
-    print_cleanup_summary(cleanup_candidates)
+    print_cleanup_summary(cleanup_candidates, show_size=not args.no_size, max_workers=args.workers)
     
     # 如果是预览模式，直接退出
     if args.dry_run:
@@ -332,15 +400,23 @@ def main():
     
     deleted_count = 0
     
-    for folder_name, info in sorted(cleanup_candidates.items(), key=lambda x: x[1]['job_num']):
-        job_num = info['job_num']
-        task_count = info['task_count']
-        folder_path = info['path']
+    # 删除主要耗时在文件系统调用上，多个文件夹用线程并发删除，结果按顺序打印
+    sorted_candidates = sorted(cleanup_candidates.items(), key=lambda x: x[1]['job_num'])
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        outcomes = executor.map(delete_job_folder, [info['path'] for _, info in sorted_candidates])
         
-        print(f"\n🗑️  删除 Job {job_num} (tasks={task_count}):")
-        
-        if delete_job_folder(folder_path):
-            deleted_count += 1
+        for (folder_name, info), (success, error) in zip(sorted_candidates, outcomes):
+            job_num = info['job_num']
+            task_count = info['task_count']
+            folder_path = info['path']
+            
+            print(f"\n🗑️  删除 Job {job_num} (tasks={task_count}):")
+            
+            if success:
+                print(f"  ✅ 已删除: {folder_path}")
+                deleted_count += 1
+            else:
+                print(f"  ❌ 删除失败 {folder_path}: {error}")
     
     # 打印完成摘要
     print(f"\n{'='*80}")
@@ -6,17 +6,25 @@
 
 import os
 import csv
-import json
+from operator import itemgetter
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
-import matplotlib.pyplot as plt
+from io import StringIO
 import matplotlib
+# 只输出 PNG 文件，使用非交互式的 Agg 后端，避免探测/初始化 GUI 后端
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
 import numpy as np
 
 # 设置中文字体支持
 matplotlib.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
 matplotlib.rcParams['axes.unicode_minus'] = False
 
+# PNG 编码参数：图表只在本地 HTML 报告中查看，用最低的 zlib 压缩等级换取更快的编码
+PNG_PIL_KWARGS = {'compress_level': 1}
+
 # 13个类别
 CATEGORIES = [
     '01-Illegal_Activitiy',
@@ -51,10 +59,20 @@ CATEGORY_LABELS = [
     'Gov'
 ]
 
-def read_csv_file(filepath):
+# 类别 -> 简称
+CATEGORY_TO_LABEL = dict(zip(CATEGORIES, CATEGORY_LABELS))
+
+# 只有 13 个类别的汇总 CSV 不会超过这个大小，更大的文件无需打开统计行数
+MAX_SUMMARY_CSV_SIZE = 64 * 1024
+
+def read_csv_file(filepath, content=None):
     """
     读取 CSV 文件并返回数据
     
+    Args:
+        filepath: CSV 文件路径
+        content: 已经读入的文件内容（可选），提供时直接解析，不再重新打开文件
+    
     Returns:
         tuple: (attack_rates, stats)
         - attack_rates: {category: attack_rate}
@@ -63,33 +81,50 @@ def read_csv_file(filepath):
     attack_rates = {}
     stats = {}
     
-    with open(filepath, 'r', encoding='utf-8') as f:
+    # newline=None 与文本模式 open() 一样统一换行符
+    source = StringIO(content, newline=None) if content is not None else open(filepath, 'r', encoding='utf-8')
+    with source as f:
         reader = csv.DictReader(f)
+        
+        # 攻击率列的格式由表头决定，每个文件只判断一次
+        # 两种格式：
+        # 1. Attack_Rate(%) - 已经是百分比（6.19 = 6.19%）
+        # 2. attack_rate - 是小数（0.0206 = 2.06%，需要×100）
+        fieldnames = reader.fieldnames or []
+        if 'Attack_Rate(%)' in fieldnames:
+            rate_field = 'Attack_Rate(%)'
+            is_percentage = True
+        elif 'attack_rate' in fieldnames:
+            rate_field = 'attack_rate'
+            is_percentage = False  # 小数格式，需要×100
+        else:
+            return attack_rates, stats
+        
+        category_field = 'Category' if 'Category' in fieldnames else 'category'
+        
+        # 统计列（Evaluated, Unsafe, Safe）的取值函数也只构造一次；缺失的列按 0 处理
+        stat_fields = ('Evaluated', 'Unsafe', 'Safe')
+        if all(field in fieldnames for field in stat_fields):
+            get_stats = itemgetter(*stat_fields)
+        else:
+            def get_stats(row):
+                return tuple(row.get(field, 0) for field in stat_fields)
+        
         for row in reader:
             # 处理不同的列名格式
-            category = row.get('Category') or row.get('category')
+            category = row.get(category_field)
             
             if not category:
                 continue
             
             # 提取攻击率
-            # 两种格式：
-            # 1. Attack_Rate(%) - 已经是百分比（6.19 = 6.19%）
-            # 2. attack_rate - 是小数（0.0206 = 2.06%，需要×100）
-            if 'Attack_Rate(%)' in row:
-                attack_rate_str = row['Attack_Rate(%)']
-                is_percentage = True
-            elif 'attack_rate' in row:
-                attack_rate_str = row['attack_rate']
-                is_percentage = False  # 小数格式，需要×100
-            else:
-                continue
+            attack_rate_str = row[rate_field]
             
             if not attack_rate_str:
                 continue
             
             try:
-                attack_rate = float(str(attack_rate_str).replace('%', '').strip())
+                attack_rate = float(attack_rate_str.replace('%', '').strip())
                 # 如果是小数格式，转换为百分比
                 if not is_percentage and attack_rate < 1.0:
                     attack_rate *= 100
@@ -101,9 +136,7 @@ def read_csv_file(filepath):
             
             # 提取统计数据（Evaluated, Unsafe, Safe）
             try:
-                evaluated = int(row.get('Evaluated', 0))
-                unsafe = int(row.get('Unsafe', 0))
-                safe = int(row.get('Safe', 0))
+                evaluated, unsafe, safe = map(int, get_stats(row))
                 
                 stats[category] = {
                     'evaluated': evaluated,
@@ -214,49 +247,68 @@ def parse_filename(filename):
     
     return brand, model_display_name, timestamp
 
+def count_lines(data):
+    """
+    统计文件内容的行数（与按行迭代文本文件的结果一致）
+    
+    直接在字节内容上用 C 层统计换行符，不逐行解码；
+    文本模式下单独的回车符也算换行，含回车符时先统一换成换行符
+    """
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    line_count = data.count(b'\n')
+    if data and not data.endswith(b'\n'):
+        line_count += 1  # 最后一行没有换行符
+    return line_count
+
 def load_all_data():
     """加载所有 1680 任务的评估数据，按品牌分组"""
     output_dir = 'output'
     all_data = defaultdict(list)  # {brand: [(model_display_name, timestamp, data, stats), ...]}
     
-    for filename in os.listdir(output_dir):
-        if filename.startswith('eval_') and filename.endswith('.csv') and 'tasks_1680' in filename:
-            filepath = os.path.join(output_dir, filename)
-            
-            # 解析文件名
-            brand, model_display_name, timestamp = parse_filename(filename)
-            
-            # 读取数据（现在返回 attack_rates 和 stats）
-            attack_rates, stats = read_csv_file(filepath)
-            
-            all_data[brand].append({
-                'model_display_name': model_display_name,
-                'timestamp': timestamp,
-                'data': attack_rates,
-                'stats': stats,
-                'filename': filename
-            })
+    # 单次 os.scandir 遍历目录，按是否有 tasks_1680 标记分成两组
+    tasks_1680_files = []
+    other_files = []
+    with os.scandir(output_dir) as it:
+        for entry in it:
+            filename = entry.name
+            if filename.startswith('eval_') and filename.endswith('.csv'):
+                if 'tasks_1680' in filename:
+                    tasks_1680_files.append(filename)
+                else:
+                    try:
+                        if entry.stat().st_size <= MAX_SUMMARY_CSV_SIZE:
+                            other_files.append(filename)
+                        else:
+                            print(f"⚠️  跳过超过 {MAX_SUMMARY_CSV_SIZE // 1024}KB 的文件（不是 13 个类别的汇总 CSV）: {filename}")
+                    except OSError:
+                        pass
     
     # 同时检查没有 tasks_1680 标记但是有 14 行（13个类别+表头）或 15 行（+空行）的文件
-    for filename in os.listdir(output_dir):
-        if filename.startswith('eval_') and filename.endswith('.csv') and 'tasks_1680' not in filename:
-            filepath = os.path.join(output_dir, filename)
-            
-            # 检查行数
-            with open(filepath, 'r') as f:
-                line_count = sum(1 for _ in f)
-            
-            if line_count == 14 or line_count == 15:  # 13 类别 + 1 表头 (+ 可能的空行)
-                brand, model_display_name, timestamp = parse_filename(filename)
-                attack_rates, stats = read_csv_file(filepath)
-                
-                all_data[brand].append({
-                    'model_display_name': model_display_name,
-                    'timestamp': timestamp,
-                    'data': attack_rates,
-                    'stats': stats,
-                    'filename': filename
-                })
+    # 统计行数时已读入的内容直接交给 read_csv_file 解析，不再重新打开文件
+    other_contents = {}
+    for filename in other_files:
+        with open(os.path.join(output_dir, filename), 'rb') as f:
+            data = f.read()
+        if count_lines(data) in (14, 15):
+            other_contents[filename] = data.decode('utf-8')
+    
+    for filename in tasks_1680_files + list(other_contents):
+        filepath = os.path.join(output_dir, filename)
+        
+        # 解析文件名
+        brand, model_display_name, timestamp = parse_filename(filename)
+        
+        # 读取数据（现在返回 attack_rates 和 stats）
+        attack_rates, stats = read_csv_file(filepath, content=other_contents.get(filename))
+        
+        all_data[brand].append({
+            'model_display_name': model_display_name,
+            'timestamp': timestamp,
+            'data': attack_rates,
+            'stats': stats,
+            'filename': filename
+        })
     
     return all_data
 
@@ -285,45 +337,46 @@ def average_multiple_runs(models_data):
     tested_categories = {}  # 记录每个模型实际测试了哪些类别
     averaged_stats = {}  # 统计数据（加总）
     
+    stat_keys = ('evaluated', 'unsafe', 'safe')
+    
     for model_name, items in model_groups.items():
+        # 每个模型的多次运行组成 (运行次数, 类别数) 的矩阵，按列一次性求平均
+        # 缺失的攻击率记为 NaN；统计数据只在该次运行测试了该类别且有统计时计入
+        rates = np.array([[item['data'].get(cat, np.nan) for cat in CATEGORIES] for item in items],
+                         dtype=np.float64)
+        has_rate = ~np.isnan(rates)
+        rate_counts = has_rate.sum(axis=0)
+        avg_rates = np.where(has_rate, rates, 0.0).sum(axis=0) / np.maximum(rate_counts, 1)
+        
+        has_stats = has_rate & np.array(
+            [[category in item.get('stats', {}) for category in CATEGORIES] for item in items], dtype=bool)
+        stat_counts = has_stats.sum(axis=0)
+        stat_sums = {
+            key: np.array([[item['stats'][cat][key] if has_stats[i, j] else 0
+                            for j, cat in enumerate(CATEGORIES)] for i, item in enumerate(items)],
+                          dtype=np.int64).sum(axis=0)
+            for key in stat_keys
+        }
+        
         averaged_data[model_name] = {}
         tested_categories[model_name] = set()
         averaged_stats[model_name] = {}
         
-        for category in CATEGORIES:
-            rates = []
-            stats_list = []
-            
-            for item in items:
-                if category in item['data']:
-                    rates.append(item['data'][category])
-                    if 'stats' in item and category in item['stats']:
-                        stats_list.append(item['stats'][category])
-            
-            if rates:
-                averaged_data[model_name][category] = np.mean(rates)
+        for j, category in enumerate(CATEGORIES):
+            if rate_counts[j]:
+                averaged_data[model_name][category] = avg_rates[j]
                 tested_categories[model_name].add(category)  # 记录实际测试的类别
                 
                 # 统计数据取平均（对于多次运行）
-                if stats_list:
+                if stat_counts[j]:
                     averaged_stats[model_name][category] = {
-                        'evaluated': int(np.mean([s['evaluated'] for s in stats_list])),
-                        'unsafe': int(np.mean([s['unsafe'] for s in stats_list])),
-                        'safe': int(np.mean([s['safe'] for s in stats_list]))
+                        key: int(stat_sums[key][j] / stat_counts[j]) for key in stat_keys
                     }
                 else:
-                    averaged_stats[model_name][category] = {
-                        'evaluated': 0,
-                        'unsafe': 0,
-                        'safe': 0
-                    }
+                    averaged_stats[model_name][category] = {key: 0 for key in stat_keys}
             else:
                 averaged_data[model_name][category] = 0.0
-                averaged_stats[model_name][category] = {
-                    'evaluated': 0,
-                    'unsafe': 0,
-                    'safe': 0
-                }
+                averaged_stats[model_name][category] = {key: 0 for key in stat_keys}
     
     return averaged_data, tested_categories, averaged_stats
 
@@ -344,7 +397,7 @@ def create_bar_chart(brand, averaged_data, output_file, tested_categories=None):
             all_tested.update(model_cats)
         # 按 CATEGORIES 的顺序过滤
         display_categories = [cat for cat in CATEGORIES if cat in all_tested]
-        display_labels = [CATEGORY_LABELS[CATEGORIES.index(cat)] for cat in display_categories]
+        display_labels = [CATEGORY_TO_LABEL[cat] for cat in display_categories]
     else:
         display_categories = CATEGORIES
         display_labels = CATEGORY_LABELS
@@ -380,13 +433,13 @@ def create_bar_chart(brand, averaged_data, output_file, tested_categories=None):
     # 根据需要循环使用颜色
     colors = [color_palette[i % len(color_palette)] for i in range(len(variants))]
     
+    # 所有模型的数据组成 (模型数, 类别数) 的矩阵（只取实际显示的类别），每个模型取一行
+    rates_matrix = np.array([[averaged_data[variant].get(cat, 0.0) for cat in display_categories]
+                             for variant in variants], dtype=np.float64)
+    offsets = (np.arange(len(variants)) - len(variants)/2 + 0.5) * width
+    
     for i, (variant, color) in enumerate(zip(variants, colors)):
-        data = averaged_data[variant]
-        # 只取实际显示的类别的数据
-        attack_rates = [data.get(cat, 0.0) for cat in display_categories]
-        
-        offset = (i - len(variants)/2 + 0.5) * width
-        bars = ax.bar(x + offset, attack_rates, width, 
+        bars = ax.bar(x + offsets[i], rates_matrix[i], width, 
                      label=variant, color=color, alpha=0.9, edgecolor='white', linewidth=0.5)
         
         # 在所有柱子上显示数值（包括0）
@@ -426,11 +479,11 @@ def create_bar_chart(brand, averaged_data, output_file, tested_categories=None):
     # 保存图表
     plt.subplots_adjust(bottom=0.15, top=0.92, left=0.08, right=0.98)
     try:
-        plt.savefig(output_file, dpi=100)  # 进一步降低 dpi
+        fig.savefig(output_file, dpi=100, pil_kwargs=PNG_PIL_KWARGS)  # 进一步降低 dpi
     except Exception as e:
         print(f"⚠️  生成图表失败 {output_file}: {e}")
     finally:
-        plt.close()
+        plt.close(fig)
     
     print(f"✅ 生成图表: {output_file}")
 
@@ -529,11 +582,11 @@ def create_overall_attack_rate_chart(brand, overall_rates, output_file):
     # 保存图表
     plt.subplots_adjust(bottom=0.25, top=0.92, left=0.08, right=0.98)
     try:
-        plt.savefig(output_file, dpi=100)
+        fig.savefig(output_file, dpi=100, pil_kwargs=PNG_PIL_KWARGS)
     except Exception as e:
         print(f"⚠️  生成图表失败 {output_file}: {e}")
     finally:
-        plt.close()
+        plt.close(fig)
     
     print(f"✅ 生成总攻击率图表: {output_file}")
 
@@ -613,11 +666,11 @@ def create_global_overall_chart(all_models_overall_rates, all_models_stats, outp
     # 保存图表
     plt.subplots_adjust(bottom=0.25, top=0.92, left=0.08, right=0.98)
     try:
-        plt.savefig(output_file, dpi=120)
+        fig.savefig(output_file, dpi=120, pil_kwargs=PNG_PIL_KWARGS)
     except Exception as e:
         print(f"⚠️  生成图表失败 {output_file}: {e}")
     finally:
-        plt.close()
+        plt.close(fig)
     
     print(f"✅ 生成全局总攻击率图表: {output_file}")
 
@@ -651,8 +704,7 @@ def create_category_comparison_chart(category, all_models_data, all_models_stats
     rates = [models_with_data[model] for model in models]
     
     # 获取类别简称
-    category_idx = CATEGORIES.index(category) if category in CATEGORIES else -1
-    category_label = CATEGORY_LABELS[category_idx] if category_idx >= 0 else category
+    category_label = CATEGORY_TO_LABEL.get(category, category)
     
     # 创建图表
     fig, ax = plt.subplots(figsize=(max(12, len(models) * 0.6), 8))
@@ -701,18 +753,19 @@ def create_category_comparison_chart(category, all_models_data, all_models_stats
     # 保存图表
     plt.subplots_adjust(bottom=0.25, top=0.92, left=0.08, right=0.98)
     try:
-        plt.savefig(output_file, dpi=120)
+        fig.savefig(output_file, dpi=120, pil_kwargs=PNG_PIL_KWARGS)
     except Exception as e:
         print(f"⚠️  生成图表失败 {output_file}: {e}")
     finally:
-        plt.close()
+        plt.close(fig)
     
     print(f"✅ 生成类别对比图表: {output_file}")
 
 def generate_html_report(all_data, output_file='output/evaluation_report.html'):
     """生成包含所有图表的 HTML 报告"""
     
-    html_content = """
+    # 按片段收集 HTML，最后直接逐段写入文件（不拼接成一个完整的大字符串）
+    html_parts = ["""
 <!DOCTYPE html>
 <html>
 <head>
@@ -874,15 +927,15 @@ def generate_html_report(all_data, output_file='output/evaluation_report.html'):
             <li class="subsection"><a href="#global-overall-rate">Overall Attack Rate (By Rate)</a></li>
             <li class="subsection"><a href="#global-overall-name">Overall Attack Rate (By Name)</a></li>
             <li class="subsection"><a href="#global-categories">By Category (13 Charts)</a></li>
-            <li><a href="#brand-comparison">📊 Brand Comparison</a></li>"""
+            <li><a href="#brand-comparison">📊 Brand Comparison</a></li>"""]
     
     # 添加品牌到目录
     for i, brand in enumerate(sorted(all_data.keys()), 1):
         safe_brand = brand.replace(" ", "_").replace("+", "")
-        html_content += f"""
-            <li class="subsection"><a href="#brand-{safe_brand}">{brand}</a></li>"""
+        html_parts.append(f"""
+            <li class="subsection"><a href="#brand-{safe_brand}">{brand}</a></li>""")
     
-    html_content += """
+    html_parts.append("""
             <li><a href="#detailed-info">📋 Detailed Information</a></li>
             <li><a href="#notes">📝 Notes</a></li>
         </ul>
@@ -920,25 +973,23 @@ def generate_html_report(all_data, output_file='output/evaluation_report.html'):
         <div class="summary">
             <p>The following 13 charts show model performance in each specific category:</p>
         </div>
-"""
+""")
     
     # 添加类别对比图表
-    for category in CATEGORIES:
-        category_idx = CATEGORIES.index(category)
-        category_label = CATEGORY_LABELS[category_idx]
+    for category, category_label in CATEGORY_TO_LABEL.items():
         chart_filename = f'chart_category_{category_label}_{category}.png'
         
-        html_content += f"""
+        html_parts.append(f"""
         <div class="chart-container">
             <h4 style="color: #34495e;">{category_label}: {category}</h4>
             <img src="{chart_filename}" alt="{category} Comparison">
         </div>
-"""
+""")
     
-    html_content += """
+    html_parts.append("""
         <!-- 品牌对比部分 -->
         <h2 id="brand-comparison">📊 Brand Comparison</h2>
-"""
+""")
     
     # 为每个品牌生成图表和统计
     for i, (brand, models_data) in enumerate(sorted(all_data.items()), 1):
@@ -953,7 +1004,7 @@ def generate_html_report(all_data, output_file='output/evaluation_report.html'):
         overall_chart_file = f'chart_{i}_{safe_brand}_overall.png'
         
         # 添加到 HTML（添加锚点）
-        html_content += f"""
+        html_parts.append(f"""
         <h3 id="brand-{safe_brand}">{i}. {brand}</h3>
         
         <h4>Overall Attack Rate Comparison</h4>
@@ -967,7 +1018,7 @@ def generate_html_report(all_data, output_file='output/evaluation_report.html'):
         </div>
     
     <div class="stats-grid">
-"""
+""")
         
         # 添加统计卡片
         for model_name, data in averaged_data.items():
@@ -984,20 +1035,20 @@ def generate_html_report(all_data, output_file='output/evaluation_report.html'):
             # 获取总攻击率
             overall_rate = overall_rates.get(model_name, 0.0)
             
-            html_content += f"""
+            html_parts.append(f"""
         <div class="stat-card">
             <div class="stat-label">{model_name}</div>
             <div class="stat-value">{overall_rate:.1f}%</div>
             <div class="timestamp">Overall Attack Rate | Avg by Category: {avg_attack_rate:.1f}% ({num_categories} categories)</div>
         </div>
-"""
+""")
         
-        html_content += """
+        html_parts.append("""
         </div>
-"""
+""")
     
     # 添加详细信息表格
-    html_content += """
+    html_parts.append("""
         <h2 id="detailed-info">📋 Detailed Information</h2>
         <table>
             <thead>
@@ -1009,7 +1060,7 @@ def generate_html_report(all_data, output_file='output/evaluation_report.html'):
                 </tr>
             </thead>
             <tbody>
-"""
+""")
     
     # 收集所有品牌的详细信息
     for brand, models_data in sorted(all_data.items()):
@@ -1023,16 +1074,16 @@ def generate_html_report(all_data, output_file='output/evaluation_report.html'):
         
         for model_name, info_list in sorted(model_info.items()):
             filenames = [info['filename'] for info in info_list]
-            html_content += f"""
+            html_parts.append(f"""
                 <tr>
                     <td><strong>{brand}</strong></td>
                     <td>{model_name}</td>
                     <td>{len(filenames)}</td>
                     <td class="timestamp" style="max-width: 500px; word-break: break-all; font-size: 11px;">{', '.join(filenames)}</td>
                 </tr>
-"""
+""")
     
-    html_content += """
+    html_parts.append("""
             </tbody>
         </table>
     
@@ -1050,10 +1101,10 @@ def generate_html_report(all_data, output_file='output/evaluation_report.html'):
     </div>
 </body>
 </html>
-"""
+""")
     
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        f.writelines(html_parts)
     
     print(f"✅ 生成 HTML 报告: {output_file}")
 
@@ -1094,13 +1145,54 @@ def load_specific_data(eval_files: list):
     return all_data
 
 
-def main(eval_files: list = None, output_file: str = None):
+def _render_chart(func, args):
+    """在工作进程中生成一张图表，返回生成过程中打印的内容（由主进程按顺序输出）"""
+    out = StringIO()
+    with redirect_stdout(out):
+        func(*args)
+    return out.getvalue()
+
+def render_charts(steps, max_workers=None):
+    """
+    生成一组图表
+    
+    各图表相互独立且绘制是 CPU 密集型的，分发到多个进程并行绘制
+    （pyplot 的全局状态不是线程安全的，因此使用进程而不是线程）。
+    输出按 steps 的顺序打印，与串行执行时一致。
+    
+    Args:
+        steps: 图表任务 (func, args) 或需要原样打印的进度信息 (str) 组成的列表
+        max_workers: 并行进程数，None 为 CPU 核数；为 1（或只有一个核）时在当前进程中串行绘制
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    
+    if max_workers <= 1:
+        for step in steps:
+            if isinstance(step, str):
+                print(step)
+            else:
+                func, args = step
+                func(*args)
+        return
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = [step if isinstance(step, str) else executor.submit(_render_chart, *step)
+                   for step in steps]
+        for item in pending:
+            if isinstance(item, str):
+                print(item)
+            else:
+                print(item.result(), end='')
+
+def main(eval_files: list = None, output_file: str = None, max_workers: int = None):
     """
     主函数
     
     Args:
         eval_files: 指定的评估文件列表，如果为 None 则使用默认逻辑加载所有符合条件的文件
         output_file: 输出报告文件路径，如果为 None 则使用默认路径
+        max_workers: 并行生成图表的进程数，None 为 CPU 核数
     """
     print("📊 开始生成评估报告...\n")
     
@@ -1150,34 +1242,36 @@ def main(eval_files: list = None, output_file: str = None):
             all_models_stats[model_name] = averaged_stats[model_name]
             all_models_overall_rates[model_name] = overall_rates.get(model_name, 0.0)
     
+    # 图表任务按输出顺序排列，统一交给 render_charts 并行绘制
+    chart_steps = []
+    
     # 2. 生成全局总攻击率对比图
     # 2.1 按攻击率排序
-    create_global_overall_chart(
+    chart_steps.append((create_global_overall_chart, (
         all_models_overall_rates,
         all_models_stats,
         f'{report_dir}/chart_global_overall_attack_rate.png',
-        sort_by='rate'
-    )
+        'rate'
+    )))
     
     # 2.2 按模型名字排序
-    create_global_overall_chart(
+    chart_steps.append((create_global_overall_chart, (
         all_models_overall_rates,
         all_models_stats,
         f'{report_dir}/chart_global_overall_attack_rate_by_name.png',
-        sort_by='name'
-    )
+        'name'
+    )))
     
     # 3. 为每个类别生成对比图
-    print("\n📊 生成各类别对比图表...")
-    for category in CATEGORIES:
-        category_label = CATEGORY_LABELS[CATEGORIES.index(category)]
+    chart_steps.append("\n📊 生成各类别对比图表...")
+    for category, category_label in CATEGORY_TO_LABEL.items():
         chart_file = f'{report_dir}/chart_category_{category_label}_{category}.png'
-        create_category_comparison_chart(
+        chart_steps.append((create_category_comparison_chart, (
             category,
             all_models_data,
             all_models_stats,
             chart_file
-        )
+        )))
     
     # 4. 生成品牌分组图表（修改路径到report_dir）
     for i, (brand, models_data) in enumerate(sorted(all_data.items()), 1):
@@ -1185,11 +1279,13 @@ def main(eval_files: list = None, output_file: str = None):
         averaged_data, tested_categories, averaged_stats = average_multiple_runs(models_data)
         
         chart_file = f'{report_dir}/chart_{i}_{safe_brand}.png'
-        create_bar_chart(brand, averaged_data, chart_file, tested_categories)
+        chart_steps.append((create_bar_chart, (brand, averaged_data, chart_file, tested_categories)))
         
         overall_rates = calculate_overall_attack_rates(averaged_stats, tested_categories)
         overall_chart_file = f'{report_dir}/chart_{i}_{safe_brand}_overall.png'
-        create_overall_attack_rate_chart(brand, overall_rates, overall_chart_file)
+        chart_steps.append((create_overall_attack_rate_chart, (brand, overall_rates, overall_chart_file)))
+    
+    render_charts(chart_steps, max_workers=max_workers)
     
     # 5. 生成 HTML 报告
     report_output = f'{report_dir}/evaluation_report.html'
@@ -1212,8 +1308,10 @@ if __name__ == "__main__":
                        help="指定要处理的评估 CSV 文件列表。不指定则使用默认逻辑加载所有符合条件的文件")
     parser.add_argument("--output", default=None,
                        help="输出报告文件路径（默认: output/evaluation_report.html）")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="并行生成图表的进程数（默认: CPU 核数，1 表示串行）")
     
     args = parser.parse_args()
     
-    main(eval_files=args.files, output_file=args.output)
+    main(eval_files=args.files, output_file=args.output, max_workers=args.workers)
 
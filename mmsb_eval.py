@@ -9,7 +9,7 @@ import re
 from typing import Dict, List, Optional
 from openai import AsyncOpenAI
 from pseudo_random_sampler import sample_by_category, print_sampling_stats
-from check_vsp_tool_usage import extract_result_section, check_tool_usage, check_code_usage
+from check_vsp_tool_usage import open_log, extract_result_section, check_tool_usage, check_code_usage
 
 start_time = time.time()
 
@@ -167,22 +167,20 @@ def check_vsp_tool_usage_from_log(log_file_path: str) -> Optional[tuple]:
         return None
     
     try:
-        with open(log_file_path, 'r', encoding='utf-8') as f:
-            log_content = f.read()
-    except Exception as e:
+        with open_log(log_file_path) as log_content:
+            # 使用统一的提取和检测逻辑（来自 check_vsp_tool_usage.py）
+            result_start = extract_result_section(log_content)
+            
+            if result_start == -1:
+                return None
+            
+            # 检测 VSP 工具使用和代码使用（独立统计）
+            used_vsp_tools = check_tool_usage(log_content, result_start)
+            used_code = check_code_usage(log_content, result_start)
+    except (OSError, ValueError) as e:
         print(f"⚠️  读取 VSP debug log 失败: {log_file_path} - {e}")
         return None
     
-    # 使用统一的提取和检测逻辑（来自 check_vsp_tool_usage.py）
-    result_section = extract_result_section(log_content)
-    
-    if not result_section:
-        return None
-    
-    # 检测 VSP 工具使用和代码使用（独立统计）
-    used_vsp_tools = check_tool_usage(result_section)
-    used_code = check_code_usage(result_section)
-    
     return (used_vsp_tools, used_code)
 
 def extract_answer_text(pred: List[Dict]) -> str:
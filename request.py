@@ -59,30 +59,42 @@ from pseudo_random_sampler import sample_by_category, print_sampling_stats
 
 # ============ Task Counter（单调递增的任务编号）============
 
+try:
+    import fcntl
+except ImportError:  # Windows 没有 fcntl，无法对计数器文件加锁
+    fcntl = None
+
 TASK_COUNTER_FILE = "output/.task_counter"
 
 def get_next_task_num() -> int:
     """
     获取下一个任务编号（单调递增，从1开始）
     
+    读取-加一-写回在同一个文件句柄上完成，并用 fcntl.flock 加排他锁，
+    多个 request.py 同时启动（如 batch_request.py 并发运行）时不会拿到相同的编号。
+    
     Returns:
         下一个可用的任务编号
     """
-    os.makedirs("output", exist_ok=True)
+    os.makedirs(os.path.dirname(TASK_COUNTER_FILE) or ".", exist_ok=True)
     
-    if os.path.exists(TASK_COUNTER_FILE):
+    # 'a+' 打开：文件不存在时创建，且不会在加锁之前就截断已有内容
+    with open(TASK_COUNTER_FILE, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)  # 关闭文件时自动释放
+        
+        f.seek(0)
         try:
-            with open(TASK_COUNTER_FILE, 'r') as f:
-                current = int(f.read().strip())
+            current = int(f.read().strip())
         except (ValueError, IOError):
             current = 0
-    else:
-        current = 0
-    
-    next_num = current + 1
-    
-    with open(TASK_COUNTER_FILE, 'w') as f:
+        
+        next_num = current + 1
+        
+        f.seek(0)
+        f.truncate()
         f.write(str(next_num))
+        f.flush()  # 在释放锁之前写出
     
     return next_num
 
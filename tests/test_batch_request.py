@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+批量运行脚本单元测试
+
+测试 batch_request.py 中不依赖真实 request.py 运行的部分：
+- OutputScanner / parse_output: 按任意分块增量扫描的结果与对完整输出做正则搜索一致
+- stream_output: 按块读取子进程输出并增量解码（多字节字符跨块、结尾不完整的字节序列）
+- main: 中断时 batch.log 的缓冲内容不会丢失，还没开始的运行不再启动
+"""
+
+import unittest
+import sys
+import os
+import re
+import glob
+import io
+import random
+import tempfile
+import threading
+from unittest import mock
+
+# 添加父目录到路径以导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch_request
+
+
+def reference_parse_output(output: str) -> dict:
+    """参照实现：对完整输出逐个字段做正则搜索（增量扫描之前的做法）"""
+    info = {}
+    
+    task_num_match = re.search(r'🔢 任务编号:\s*(\d+)', output)
+    if task_num_match:
+        info['task_num'] = int(task_num_match.group(1))
+    
+    job_folder_match = re.search(r'✅ Job 文件夹已重命名:\s*(\S+)', output)
+    if job_folder_match:
+        info['job_folder'] = job_folder_match.group(1)
+    else:
+        temp_folder_match = re.search(r'📁 创建临时 job 文件夹:\s*(\S+)', output)
+        if temp_folder_match:
+            info['job_folder'] = temp_folder_match.group(1)
+    
+    output_file_match = re.search(r'✅ 文件已重命名:\s*(\S+\.jsonl)', output)
+    if output_file_match:
+        info['output_file'] = output_file_match.group(1)
+    else:
+        output_file_match2 = re.search(r'输出文件:\s*(\S+\.jsonl)', output)
+        if output_file_match2:
+            info['output_file'] = output_file_match2.group(1)
+    
+    vsp_dir_match = re.search(r'✅ VSP 详细输出目录已重命名:\s*(\S+)', output)
+    if vsp_dir_match:
+        info['vsp_dir'] = vsp_dir_match.group(1)
+    
+    eval_file_match = re.search(r'✅ 评估指标已保存:\s*(\S+\.csv)', output)
+    if eval_file_match:
+        info['eval_file'] = eval_file_match.group(1)
+    
+    summary_match = re.search(r'✅ Summary 已保存:\s*(\S+\.html)', output)
+    if summary_match:
+        info['summary_file'] = summary_match.group(1)
+    
+    total_tasks_match = re.search(r'总任务数:\s*(\d+)', output)
+    if total_tasks_match:
+        info['total_tasks'] = int(total_tasks_match.group(1))
+    
+    stop_match = re.search(r"自动停止原因:\s*(.+)", output)
+    info['stop_reason'] = stop_match.group(1).strip() if stop_match else None
+    
+    return info
+
+
+# 模拟 request.py 的输出，覆盖值在下一行、同一字段出现多次、回车符进度条等情况
+SAMPLE_OUTPUTS = [
+    (
+        "🔢 任务编号: 42\n"
+        "📁 创建临时 job 文件夹: output/job_42_temp_Openai_gpt-5_1116_080628\n"
+        "处理中: 10%|█         | 1/10\r处理中: 50%|█████     | 5/10\r处理中: 100%|██████████| 10/10\n"
+        "输出文件: output/job_42_temp/output.jsonl\n"
+        "总任务数: 10\n"
+        "✅ 文件已重命名: output/job_42_tasks_10/output.jsonl\n"
+        "✅ Job 文件夹已重命名: output/job_42_tasks_10_Openai_gpt-5_1116_080628\n"
+        "✅ VSP 详细输出目录已重命名: output/vsp_42\n"
+        "✅ 评估指标已保存: output/job_42/eval.csv\n"
+        "✅ Summary 已保存: output/job_42/summary.html\n"
+    ),
+    (
+        # 值在下一行（\s* 可以跨行）、第一次出现的值不符合格式
+        "🔢 任务编号:\n\n  7\n"
+        "✅ 文件已重命名: output/not_jsonl.txt\n"
+        "✅ 文件已重命名:\noutput/job_7/output.jsonl\n"
+        "✅ 评估指标已保存: \r\n output/job_7/eval.csv\r\n"
+        "自动停止原因:   \n  连续错误次数达到 5 次\r\n"
+        "总任务数: 3\n"
+    ),
+    (
+        # 字段出现在输出末尾、没有换行
+        "无关的输出 " * 50 + "\n"
+        "📁 创建临时 job 文件夹: output/job_9_temp\n"
+        "自动停止原因: 错误率超过 20%\n"
+        "✅ Summary 已保存: output/job_9/summary.html"
+    ),
+    (
+        # 固定文本之后只有空白就结束
+        "总任务数: abc\n"
+        "自动停止原因:   "
+    ),
+]
+
+
+def feed_in_random_chunks(scanner, text, rng, max_chunk):
+    """把 text 切成随机长度的分块依次喂给 scanner"""
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(1, max_chunk)
+        scanner.feed(text[pos:pos + size])
+        pos += size
+    scanner.close()
+
+
+class TestOutputScanner(unittest.TestCase):
+    """测试 OutputScanner 增量扫描"""
+    
+    def parse_in_chunks(self, text, rng, max_chunk):
+        scanner = batch_request.OutputScanner()
+        feed_in_random_chunks(scanner, text, rng, max_chunk)
+        info = scanner.result()
+        info['stop_reason'] = scanner.stop_reason
+        return info
+    
+    def test_whole_output(self):
+        """测试一次性喂入完整输出时与参照实现一致"""
+        for text in SAMPLE_OUTPUTS:
+            with self.subTest(text=text[:30]):
+                info = batch_request.parse_output(text)
+                expected = reference_parse_output(text)
+                expected.pop('stop_reason')
+                self.assertEqual(info, expected)
+    
+    def test_random_chunks_match_whole_text_parse(self):
+        """测试按随机长度分块喂入时，解析结果与对完整输出做正则搜索一致"""
+        rng = random.Random(20251116)
+        for text in SAMPLE_OUTPUTS:
+            expected = reference_parse_output(text)
+            for max_chunk in (1, 2, 3, 7, 16, 64, 1024):
+                for _ in range(20):
+                    with self.subTest(text=text[:30], max_chunk=max_chunk):
+                        self.assertEqual(self.parse_in_chunks(text, rng, max_chunk), expected)
+    
+    def test_pending_output_is_bounded(self):
+        """测试没有换行的超长输出（如回车符进度条）不会让保留内容无限增长"""
+        progress = "".join(f"\r处理中: {i}/100000" for i in range(20000))
+        text = "🔢 任务编号: 5\n总任务数: " + progress + "\n✅ Summary 已保存: output/job_5/summary.html\n"
+        
+        scanner = batch_request.OutputScanner()
+        for i in range(0, len(text), 4096):
+            scanner.feed(text[i:i + 4096])
+            self.assertLessEqual(len(scanner._partial), batch_request.OutputScanner.MAX_PENDING_SIZE + 4096)
+        scanner.close()
+        
+        info = scanner.result()
+        info['stop_reason'] = scanner.stop_reason
+        self.assertEqual(info, reference_parse_output(text))
+        self.assertEqual(info['task_num'], 5)
+        self.assertEqual(info['summary_file'], 'output/job_5/summary.html')
+
+
+class FakeProcess:
+    """只提供 stdout 二进制管道的子进程替身"""
+    
+    def __init__(self, data: bytes):
+        self.stdout = io.BufferedReader(io.BytesIO(data))
+
+
+class TestStreamOutput(unittest.TestCase):
+    """测试 stream_output 的分块读取和增量解码"""
+    
+    def stream(self, data: bytes, chunk_size: int):
+        out = io.StringIO()
+        scanner = batch_request.OutputScanner()
+        with mock.patch.object(batch_request, 'READ_CHUNK_SIZE', chunk_size):
+            batch_request.stream_output(FakeProcess(data), out, scanner)
+        return out.getvalue(), scanner
+    
+    def test_multibyte_char_split_across_chunks(self):
+        """测试多字节 UTF-8 字符被 READ_CHUNK_SIZE 切开时仍然正确解码和解析"""
+        text = "🔢 任务编号: 12\n总任务数: 3\n✅ Summary 已保存: output/任务_12/summary.html\n"
+        data = text.encode('utf-8')
+        for chunk_size in range(1, 9):
+            with self.subTest(chunk_size=chunk_size):
+                output, scanner = self.stream(data, chunk_size)
+                self.assertEqual(output, text)
+                self.assertEqual(scanner.result(), {
+                    'task_num': 12,
+                    'total_tasks': 3,
+                    'summary_file': 'output/任务_12/summary.html',
+                })
+    
+    def test_partial_sequence_at_eof(self):
+        """测试输出以不完整的 UTF-8 字节序列结束时，EOF 时写出替换字符并完成扫描"""
+        data = "自动停止原因: 连续错误".encode('utf-8') + "中".encode('utf-8')[:2]
+        for chunk_size in (1, 2, 5, 65536):
+            with self.subTest(chunk_size=chunk_size):
+                output, scanner = self.stream(data, chunk_size)
+                self.assertEqual(output, "自动停止原因: 连续错误\ufffd")
+                self.assertEqual(scanner.stop_reason, "连续错误\ufffd")
+                self.assertEqual(scanner._partial, '')
+    
+    def test_invalid_bytes_are_replaced(self):
+        """测试非法字节被替换而不是抛出异常"""
+        output, _ = self.stream(b"ok \xff\xfe done\n", 2)
+        self.assertEqual(output, "ok \ufffd\ufffd done\n")
+
+
+class TestBatchLogging(unittest.TestCase):
+    """测试 batch.log 的写出"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        self.tmp_dir.cleanup()
+
+    def test_keyboard_interrupt_flushes_log(self):
+        """测试非详细输出模式下 Ctrl-C 中断时，已缓冲的日志仍然写入 batch.log"""
+        original_stdout = sys.stdout
+        with mock.patch.object(batch_request, 'VERBOSE', False), \
+                mock.patch.object(batch_request, 'PARALLEL', 1), \
+                mock.patch.object(batch_request, 'run_request', side_effect=KeyboardInterrupt) as run:
+            with self.assertRaises(KeyboardInterrupt):
+                batch_request.main()
+
+        # 串行运行时第一次中断就停止，后面的组合不再运行
+        self.assertEqual(run.call_count, 1)
+        self.assertIs(sys.stdout, original_stdout)
+        log_files = glob.glob(os.path.join('output', 'batch_*', 'batch.log'))
+        self.assertEqual(len(log_files), 1)
+        with open(log_files[0], encoding='utf-8') as f:
+            log = f.read()
+        self.assertIn('批量运行 request.py', log)
+        self.assertIn('将运行以下组合', log)
+
+    def test_parallel_interrupt_cancels_pending_runs(self):
+        """测试并发运行时主线程收到 Ctrl-C，排队中的组合不再启动"""
+        started = []
+        finished = []
+        first_started = threading.Event()
+        release = threading.Event()
+
+        def blocking_run_request(args_str, run_index, total_runs, buffered=False):
+            started.append(run_index)
+            first_started.set()
+            release.wait(timeout=10)
+            finished.append(run_index)
+
+        def interrupted_as_completed(futures):
+            # 模拟第一个运行还在进行时主线程收到 SIGINT
+            first_started.wait(timeout=10)
+            raise KeyboardInterrupt
+            yield
+
+        combo = [[f'--max_tasks {i}' for i in range(1, 7)]]
+        with mock.patch.object(batch_request, 'VERBOSE', False), \
+                mock.patch.object(batch_request, 'PARALLEL', 2), \
+                mock.patch.object(batch_request, 'GENERATE_REPORT', False), \
+                mock.patch.object(batch_request, 'args_combo', combo), \
+                mock.patch.object(batch_request, 'run_request', side_effect=blocking_run_request), \
+                mock.patch.object(batch_request, 'as_completed', interrupted_as_completed):
+            with self.assertRaises(KeyboardInterrupt):
+                batch_request.main()
+            # 中断在运行结束之前就传到了调用方
+            self.assertEqual(finished, [])
+            release.set()
+            for thread in threading.enumerate():
+                if thread.name.startswith('ThreadPoolExecutor'):
+                    thread.join(timeout=10)
+
+        self.assertTrue(started)
+        self.assertTrue(set(started) <= {1, 2})
+        self.assertEqual(sorted(finished), sorted(started))
+
+
+if __name__ == '__main__':
+    unittest.main()
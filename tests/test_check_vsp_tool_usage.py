@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+VSP 工具使用统计单元测试
+
+测试 check_vsp_tool_usage.py 的分析结果缓存：
+- 缓存命中时统计结果与首次分析一致
+- 修改过的文件（mtime/大小变化）会重新分析
+- 本目录下已删除的文件从缓存中移除，其他目录的条目保留；内容不变时不重写缓存文件
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+# 添加父目录到路径以导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import check_vsp_tool_usage
+
+
+def make_log(used_tools: bool) -> str:
+    """构造一个新格式的 vsp_debug.log"""
+    answer = "[VSP_TOOL_USED] detection(image_1)" if used_tools else "```python\nprint(1)\n```"
+    return (
+        "# USER REQUEST #:\nDescribe the image.\n"
+        "ATTENTION! YOUR ACTUAL TASK BEGINS HERE\n"
+        f"# RESULT #:\n{answer}\n"
+    )
+
+
+class TestScanCache(unittest.TestCase):
+    """测试 analyze_vsp_logs 的分析结果缓存"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.vsp_dir = os.path.join(self.tmp_dir.name, "vsp_details", "vsp_2025-11-16_08-06-28")
+        self.cache_file = os.path.join(self.tmp_dir.name, "output", ".vsp_scan_cache.json")
+        self.cache_patch = mock.patch.object(check_vsp_tool_usage, "VSP_SCAN_CACHE_FILE", self.cache_file)
+        self.cache_patch.start()
+
+        self.log_files = {}
+        for category, index, used_tools in [
+            ("01-Illegal_Activitiy", "0", True),
+            ("01-Illegal_Activitiy", "1", False),
+            ("02-HateSpeech", "0", True),
+        ]:
+            self.log_files[(category, index)] = self.write_log(category, index, make_log(used_tools))
+
+    def tearDown(self):
+        self.cache_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def write_log(self, category, index, content, vsp_dir=None):
+        log_dir = os.path.join(vsp_dir or self.vsp_dir, category, index, "output")
+        os.makedirs(log_dir, exist_ok=True)
+        log_file = os.path.join(log_dir, "vsp_debug.log")
+        with open(log_file, "w", encoding="utf-8") as f:
+            f.write(content)
+        return log_file
+
+    def analyze(self, vsp_dir=None, **kwargs):
+        out = StringIO()
+        with redirect_stdout(out):
+            check_vsp_tool_usage.analyze_vsp_logs(vsp_dir or self.vsp_dir, max_workers=1, **kwargs)
+        return out.getvalue()
+
+    def load_cache(self):
+        with open(self.cache_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    def rewrite_keep_stat(self, log_file):
+        """改写内容但保持 mtime 和大小不变：命中缓存时仍然得到上次的结果"""
+        st = os.stat(log_file)
+        with open(log_file, "r+", encoding="utf-8") as f:
+            content = f.read()
+            f.seek(0)
+            f.write(content.replace("[VSP_TOOL_USED]", "[VSP_TOOL_USEX]"))
+        os.utime(log_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    def test_warm_cache_gives_same_counts(self):
+        """测试缓存命中时输出与不使用缓存时一致"""
+        uncached = self.analyze(use_cache=False)
+        self.assertFalse(os.path.exists(self.cache_file))
+
+        cold = self.analyze()
+        self.assertEqual(set(self.load_cache()), {os.path.abspath(p) for p in self.log_files.values()})
+
+        self.rewrite_keep_stat(self.log_files[("01-Illegal_Activitiy", "0")])
+        warm = self.analyze()
+
+        self.assertEqual(cold, uncached)
+        self.assertEqual(warm, uncached)
+        self.assertIn("使用了 VSP 工具: 2 (66.7%)", warm)
+
+    def test_modified_file_is_reanalyzed(self):
+        """测试 mtime/大小变化的文件会重新分析"""
+        self.analyze()
+
+        log_file = self.write_log("01-Illegal_Activitiy", "1", make_log(True) + "\n")
+        st = os.stat(log_file)
+        os.utime(log_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        output = self.analyze()
+        self.assertIn("使用了 VSP 工具: 3 (100.0%)", output)
+        self.assertEqual(self.load_cache()[os.path.abspath(log_file)][:2],
+                         [os.stat(log_file).st_mtime_ns, os.stat(log_file).st_size])
+
+    def test_deleted_files_are_pruned(self):
+        """测试已删除的文件不再保留在缓存中"""
+        self.analyze()
+
+        removed = self.log_files[("02-HateSpeech", "0")]
+        os.remove(removed)
+        self.analyze()
+
+        self.assertNotIn(os.path.abspath(removed), self.load_cache())
+        self.assertEqual(len(self.load_cache()), 2)
+
+    def test_alternating_directories_keep_each_others_entries(self):
+        """测试交替分析两个目录时互不清除对方的缓存条目"""
+        # 另一个目录与本目录同名前缀（vsp_..._B 以 vsp_... 开头），不能被当成本目录的子路径
+        other_dir = self.vsp_dir + "_B"
+        other_log = self.write_log("03-Malware_Generation", "0", make_log(False), vsp_dir=other_dir)
+
+        self.analyze()
+        self.analyze(vsp_dir=other_dir)
+        self.assertEqual(set(self.load_cache()),
+                         {os.path.abspath(p) for p in [*self.log_files.values(), other_log]})
+
+        # 第三次分析第一个目录时全部命中缓存：改写过的文件仍然按上次的结果统计，缓存也不重写
+        self.rewrite_keep_stat(self.log_files[("01-Illegal_Activitiy", "0")])
+        with mock.patch.object(check_vsp_tool_usage, "save_scan_cache") as save:
+            output = self.analyze()
+        save.assert_not_called()
+        self.assertIn("使用了 VSP 工具: 2 (66.7%)", output)
+
+        # 另一个目录中已删除的文件在下次保存缓存时移除
+        os.remove(other_log)
+        self.write_log("02-HateSpeech", "1", make_log(False))
+        self.analyze()
+        self.assertNotIn(os.path.abspath(other_log), self.load_cache())
+        self.assertEqual(len(self.load_cache()), 4)
+
+    def test_unchanged_cache_is_not_rewritten(self):
+        """测试缓存内容没有变化时不重写缓存文件"""
+        self.analyze()
+        with mock.patch.object(check_vsp_tool_usage, "save_scan_cache") as save:
+            self.analyze()
+        save.assert_not_called()
+
+    def test_failed_write_keeps_old_cache(self):
+        """测试写入失败时保留原有的缓存文件，也不留下临时文件"""
+        self.analyze()
+        before = self.load_cache()
+
+        with mock.patch.object(check_vsp_tool_usage.os, "replace", side_effect=OSError("disk full")):
+            with redirect_stdout(StringIO()):
+                check_vsp_tool_usage.save_scan_cache({"other": [0, 0, False, False, False, False]})
+
+        self.assertEqual(self.load_cache(), before)
+        self.assertEqual(os.listdir(os.path.dirname(self.cache_file)), [".vsp_scan_cache.json"])
+
+    def test_corrupt_cache_is_ignored(self):
+        """测试损坏的缓存文件被忽略，重新分析后写回有效的缓存"""
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, "w", encoding="utf-8") as f:
+            f.write('{"truncated": [1, 2')
+
+        output = self.analyze()
+        self.assertIn("分析缓存已损坏", output)
+        self.assertIn("使用了 VSP 工具: 2 (66.7%)", output)
+        self.assertEqual(len(self.load_cache()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+output 清理工具单元测试
+
+测试 cleanup_output.py 中的：
+- delete_job_folder: 删除 job 文件夹，失败时收集错误信息
+- main: --workers 小于 1 时退化为单线程
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import warnings
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+# 添加父目录到路径以导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cleanup_output
+
+
+def make_job_folder(output_dir, name, files=("output.jsonl", "summary.html")):
+    """创建一个包含若干文件的 job 文件夹"""
+    folder = os.path.join(output_dir, name)
+    os.makedirs(os.path.join(folder, "vsp_details"))
+    for filename in files:
+        with open(os.path.join(folder, filename), "w") as f:
+            f.write("data")
+    return folder
+
+
+class TestDeleteJobFolder(unittest.TestCase):
+    """测试 delete_job_folder 函数"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_delete(self):
+        """测试正常删除，且不触发弃用警告"""
+        folder = make_job_folder(self.tmp_dir.name, "job_1_tasks_5_Openai_gpt-5_1116_080628")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            self.assertEqual(cleanup_output.delete_job_folder(folder), (True, None))
+        self.assertFalse(os.path.exists(folder))
+
+    def test_errors_are_collected(self):
+        """测试无法删除的文件被记录，其余内容继续删除"""
+        folder = make_job_folder(self.tmp_dir.name, "job_2_tasks_5_Openai_gpt-5_1116_080628")
+        real_unlink = os.unlink
+
+        def failing_unlink(path, *args, **kwargs):
+            if os.path.basename(path) == "output.jsonl":
+                raise PermissionError("denied")
+            return real_unlink(path, *args, **kwargs)
+
+        with mock.patch.object(cleanup_output.shutil.os, "unlink", side_effect=failing_unlink):
+            success, error = cleanup_output.delete_job_folder(folder)
+
+        self.assertFalse(success)
+        self.assertIn("output.jsonl", error)
+        self.assertIn("denied", error)
+        self.assertFalse(os.path.exists(os.path.join(folder, "summary.html")))
+
+
+class TestMainWorkers(unittest.TestCase):
+    """测试 --workers 参数"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_zero_workers_falls_back_to_single_thread(self):
+        """测试 --workers 0 时仍然能计算大小并删除"""
+        folder = make_job_folder(self.tmp_dir.name, "job_3_tasks_5_Openai_gpt-5_1116_080628")
+        argv = ["cleanup_output.py", "--output_dir", self.tmp_dir.name, "--workers", "0", "--yes"]
+        out = StringIO()
+        with mock.patch.object(sys, "argv", argv), redirect_stdout(out):
+            cleanup_output.main()
+
+        self.assertFalse(os.path.exists(folder))
+        self.assertIn("已删除: 1 个 job 文件夹", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+评估报告生成单元测试
+
+测试 generate_report_with_charts.py 中的数据处理部分（不生成图表）：
+- count_lines: 在字节内容上统计行数，与按行迭代文本文件的结果一致
+- load_all_data: 按 tasks_1680 标记或行数挑选评估文件，超过大小上限的文件被跳过并提示
+- average_multiple_runs: 多次运行按列取平均，与逐类别循环的实现结果一致
+"""
+
+import unittest
+import sys
+import os
+import random
+import tempfile
+from collections import defaultdict
+from contextlib import redirect_stdout
+from io import StringIO
+
+# 添加父目录到路径以导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+    import generate_report_with_charts as report
+except ImportError:  # 报告生成依赖 numpy 和 matplotlib
+    report = None
+
+
+def reference_average_multiple_runs(models_data):
+    """参照实现：逐个模型、逐个类别循环取平均（改为 numpy 按列计算之前的做法）"""
+    model_groups = defaultdict(list)
+    for item in models_data:
+        model_groups[item['model_display_name']].append(item)
+    
+    averaged_data = {}
+    tested_categories = {}
+    averaged_stats = {}
+    
+    for model_name, items in model_groups.items():
+        averaged_data[model_name] = {}
+        tested_categories[model_name] = set()
+        averaged_stats[model_name] = {}
+        
+        for category in report.CATEGORIES:
+            rates = []
+            stats_list = []
+            
+            for item in items:
+                if category in item['data']:
+                    rates.append(item['data'][category])
+                    if 'stats' in item and category in item['stats']:
+                        stats_list.append(item['stats'][category])
+            
+            if rates:
+                averaged_data[model_name][category] = np.mean(rates)
+                tested_categories[model_name].add(category)
+                
+                if stats_list:
+                    averaged_stats[model_name][category] = {
+                        'evaluated': int(np.mean([s['evaluated'] for s in stats_list])),
+                        'unsafe': int(np.mean([s['unsafe'] for s in stats_list])),
+                        'safe': int(np.mean([s['safe'] for s in stats_list]))
+                    }
+                else:
+                    averaged_stats[model_name][category] = {'evaluated': 0, 'unsafe': 0, 'safe': 0}
+            else:
+                averaged_data[model_name][category] = 0.0
+                averaged_stats[model_name][category] = {'evaluated': 0, 'unsafe': 0, 'safe': 0}
+    
+    return averaged_data, tested_categories, averaged_stats
+
+
+def make_summary_csv(rates, trailing_newline=True, blank_lines=0):
+    """构造 13 个类别的汇总 CSV 内容（表头 + 每个类别一行）"""
+    lines = ['Category,Attack_Rate(%),Evaluated,Unsafe,Safe']
+    for category, rate in zip(report.CATEGORIES, rates):
+        lines.append(f'{category},{rate},100,{int(rate)},{100 - int(rate)}')
+    content = '\n'.join(lines) + '\n' * blank_lines
+    return content + '\n' if trailing_newline else content
+
+
+@unittest.skipIf(report is None, "需要安装 numpy 和 matplotlib")
+class TestCountLines(unittest.TestCase):
+    """测试 count_lines 函数"""
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+    
+    def text_mode_line_count(self, data):
+        """参照实现：写入文件后按行迭代文本文件"""
+        path = os.path.join(self.tmp_dir.name, 'data.csv')
+        with open(path, 'wb') as f:
+            f.write(data)
+        with open(path, 'r', encoding='utf-8') as f:
+            return sum(1 for _ in f)
+    
+    def test_matches_text_mode_iteration(self):
+        """测试各种换行情况下与文本模式按行迭代的结果一致"""
+        cases = [
+            b'',
+            b'a',
+            b'a\nb',            # 最后一行没有换行符
+            b'a\nb\n',
+            b'a\nb\n\n',        # 最后有一个空行
+            b'\n\n',
+            b'a\r\nb\r\n',      # CRLF
+            b'a\r\nb',
+            b'a\rb\rc',         # 单独的回车符
+            b'a\r\n\rb\r',
+            '类别,攻击率\n违法,1.5'.encode('utf-8'),
+        ]
+        for data in cases:
+            with self.subTest(data=data):
+                self.assertEqual(report.count_lines(data), self.text_mode_line_count(data))
+    
+    def test_summary_without_trailing_newline(self):
+        """测试没有结尾换行符的汇总 CSV 仍然是 14 行"""
+        data = make_summary_csv([1.0] * 13, trailing_newline=False).encode('utf-8')
+        self.assertEqual(report.count_lines(data), 14)
+        self.assertEqual(report.count_lines(data + b'\n'), 14)
+
+
+@unittest.skipIf(report is None, "需要安装 numpy 和 matplotlib")
+class TestLoadAllData(unittest.TestCase):
+    """测试 load_all_data 函数（在临时目录的 output/ 下构造评估文件）"""
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        os.makedirs('output')
+    
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        self.tmp_dir.cleanup()
+    
+    def write(self, filename, content):
+        with open(os.path.join('output', filename), 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+    
+    def load(self):
+        out = StringIO()
+        with redirect_stdout(out):
+            all_data = report.load_all_data()
+        loaded = {item['filename']: item for items in all_data.values() for item in items}
+        return loaded, out.getvalue()
+    
+    def test_selects_files_by_marker_and_line_count(self):
+        """测试 tasks_1680 文件总是加载，其余文件只加载 14/15 行的汇总 CSV"""
+        self.write('eval_Openai_gpt-5_1116_080628_tasks_1680.csv', make_summary_csv([10.0] * 13))
+        self.write('eval_Openai_gpt-4o_1116_080628.csv', make_summary_csv([20.0] * 13, trailing_newline=False))
+        self.write('eval_Openai_gpt-4o-mini_1116_080628.csv', make_summary_csv([30.0] * 13, blank_lines=1))
+        self.write('eval_Openai_gpt-4.1_1116_080628.csv', make_summary_csv([40.0] * 13, blank_lines=6))
+        self.write('eval_Openai_o3_1116_080628.csv', make_summary_csv([50.0] * 13, trailing_newline=False)
+                   .replace('\n', '\r\n'))
+        self.write('other_Openai_gpt-5.csv', make_summary_csv([60.0] * 13))
+        
+        loaded, output = self.load()
+        
+        self.assertEqual(set(loaded), {
+            'eval_Openai_gpt-5_1116_080628_tasks_1680.csv',
+            'eval_Openai_gpt-4o_1116_080628.csv',
+            'eval_Openai_gpt-4o-mini_1116_080628.csv',
+            'eval_Openai_o3_1116_080628.csv',
+        })
+        self.assertNotIn('跳过', output)
+        # 没有结尾换行符的文件，最后一个类别也要解析出来
+        item = loaded['eval_Openai_gpt-4o_1116_080628.csv']
+        self.assertEqual(item['data'], {category: 20.0 for category in report.CATEGORIES})
+        self.assertEqual(item['stats'][report.CATEGORIES[-1]], {'evaluated': 100, 'unsafe': 20, 'safe': 80})
+        self.assertEqual(loaded['eval_Openai_o3_1116_080628.csv']['data'],
+                         {category: 50.0 for category in report.CATEGORIES})
+    
+    def test_oversized_file_is_skipped_with_message(self):
+        """测试超过 MAX_SUMMARY_CSV_SIZE 的文件即使只有 14 行也被跳过，并打印提示"""
+        filler = 'x' * (report.MAX_SUMMARY_CSV_SIZE // 13 + 1)
+        lines = make_summary_csv([10.0] * 13).splitlines()
+        content = '\n'.join([lines[0]] + [line + ',' + filler for line in lines[1:]]) + '\n'
+        self.assertGreater(len(content.encode('utf-8')), report.MAX_SUMMARY_CSV_SIZE)
+        self.assertEqual(report.count_lines(content.encode('utf-8')), 14)
+        self.write('eval_Openai_gpt-5_1116_080628.csv', content)
+        # 大文件带 tasks_1680 标记时不受大小限制
+        self.write('eval_Openai_gpt-4o_1116_080628_tasks_1680.csv', content)
+        
+        loaded, output = self.load()
+        
+        self.assertEqual(set(loaded), {'eval_Openai_gpt-4o_1116_080628_tasks_1680.csv'})
+        self.assertIn('跳过超过 64KB 的文件', output)
+        self.assertIn('eval_Openai_gpt-5_1116_080628.csv', output)
+
+
+def make_run(model_name, rates, stats=None):
+    """构造一次运行的记录；stats 为 None 时按攻击率生成统计数据"""
+    if stats is None:
+        stats = {
+            category: {'evaluated': 100, 'unsafe': int(rate), 'safe': 100 - int(rate)}
+            for category, rate in rates.items()
+        }
+    return {
+        'model_display_name': model_name,
+        'timestamp': None,
+        'data': rates,
+        'stats': stats,
+        'filename': f'eval_{model_name}.csv',
+    }
+
+
+@unittest.skipIf(report is None, "需要安装 numpy 和 matplotlib")
+class TestAverageMultipleRuns(unittest.TestCase):
+    """测试 average_multiple_runs 函数"""
+    
+    def assertSameAsReference(self, models_data):
+        averaged_data, tested_categories, averaged_stats = report.average_multiple_runs(models_data)
+        ref_data, ref_tested, ref_stats = reference_average_multiple_runs(models_data)
+        
+        # 模型顺序（首次出现的顺序）也要一致，HTML 中的统计卡片按此顺序输出
+        self.assertEqual(list(averaged_data), list(ref_data))
+        self.assertEqual(averaged_data, ref_data)
+        self.assertEqual(tested_categories, ref_tested)
+        self.assertEqual(averaged_stats, ref_stats)
+        return averaged_data, tested_categories, averaged_stats
+    
+    def test_runs_with_different_category_sets(self):
+        """测试多次运行测试的类别不同、有缺失类别和缺失统计数据的情况"""
+        c = report.CATEGORIES
+        models_data = [
+            make_run('Model-B', {c[0]: 12.5, c[1]: 0.0}),
+            make_run('Model-A', {c[0]: 10.0, c[1]: 20.0, c[2]: 30.0}),
+            # 第二次运行缺少 c[2]，多了 c[3]
+            make_run('Model-A', {c[0]: 20.0, c[1]: 25.0, c[3]: 5.0}),
+            # 第三次运行有 c[2] 的攻击率，但没有它的统计数据
+            make_run('Model-A', {c[0]: 30.0, c[2]: 40.0},
+                     stats={c[0]: {'evaluated': 99, 'unsafe': 30, 'safe': 69}}),
+            # 没有 stats 字段的运行，以及不属于 13 个类别的条目
+            {'model_display_name': 'Model-B', 'timestamp': None,
+             'data': {c[0]: 13.75, 'Unknown-Category': 50.0}, 'filename': 'eval_b2.csv'},
+        ]
+        averaged_data, tested_categories, averaged_stats = self.assertSameAsReference(models_data)
+        
+        self.assertEqual(list(averaged_data), ['Model-B', 'Model-A'])
+        self.assertEqual(averaged_data['Model-A'][c[0]], 20.0)
+        self.assertEqual(averaged_data['Model-A'][c[1]], 22.5)  # 只有两次运行测试了 c[1]
+        self.assertEqual(averaged_data['Model-A'][c[2]], 35.0)
+        self.assertEqual(averaged_data['Model-A'][c[4]], 0.0)   # 没有测试的类别
+        self.assertEqual(tested_categories['Model-A'], {c[0], c[1], c[2], c[3]})
+        self.assertEqual(tested_categories['Model-B'], {c[0], c[1]})
+        # c[2] 只有一次运行有统计数据
+        self.assertEqual(averaged_stats['Model-A'][c[2]], {'evaluated': 100, 'unsafe': 30, 'safe': 70})
+        self.assertEqual(averaged_stats['Model-A'][c[0]], {'evaluated': 99, 'unsafe': 20, 'safe': 79})
+        self.assertEqual(averaged_stats['Model-B'][c[0]], {'evaluated': 100, 'unsafe': 12, 'safe': 88})
+        self.assertEqual(averaged_stats['Model-A'][c[4]], {'evaluated': 0, 'unsafe': 0, 'safe': 0})
+    
+    def test_random_runs(self):
+        """测试随机生成的多次运行"""
+        rng = random.Random(1680)
+        for _ in range(50):
+            models_data = []
+            for _ in range(rng.randint(1, 10)):
+                model_name = f'Model-{rng.randint(1, 3)}'
+                categories = rng.sample(report.CATEGORIES, rng.randint(0, len(report.CATEGORIES)))
+                rates = {category: round(rng.uniform(0, 100), 2) for category in categories}
+                stats = {
+                    category: {'evaluated': rng.randint(0, 200), 'unsafe': rng.randint(0, 100),
+                               'safe': rng.randint(0, 100)}
+                    for category in categories if rng.random() < 0.8
+                }
+                models_data.append(make_run(model_name, rates, stats))
+            with self.subTest(models_data=models_data):
+                self.assertSameAsReference(models_data)
+    
+    def test_empty(self):
+        """测试没有任何运行记录"""
+        self.assertEqual(report.average_multiple_runs([]), ({}, {}, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+任务编号分配测试
+
+测试 request.py 中的 get_next_task_num：
+- 单进程下编号从 1 开始单调递增
+- 多个进程同时分配编号时不会拿到重复的编号（batch_request.py 并发运行的场景）
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+import multiprocessing
+
+# 添加父目录到路径以导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import request
+
+
+NUM_PROCESSES = 8
+NUMS_PER_PROCESS = 25
+
+
+def _allocate_task_nums(counter_file, barrier, queue):
+    """子进程：等所有进程就绪后同时开始，连续分配多个任务编号"""
+    request.TASK_COUNTER_FILE = counter_file
+    barrier.wait()
+    queue.put([request.get_next_task_num() for _ in range(NUMS_PER_PROCESS)])
+
+
+class TestGetNextTaskNum(unittest.TestCase):
+    """测试 get_next_task_num 函数"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.counter_file = os.path.join(self.tmp_dir.name, "output", ".task_counter")
+        self.original_counter_file = request.TASK_COUNTER_FILE
+        request.TASK_COUNTER_FILE = self.counter_file
+
+    def tearDown(self):
+        request.TASK_COUNTER_FILE = self.original_counter_file
+        self.tmp_dir.cleanup()
+
+    def test_sequential(self):
+        """测试编号从 1 开始单调递增，并写回计数器文件"""
+        self.assertEqual([request.get_next_task_num() for _ in range(3)], [1, 2, 3])
+        with open(self.counter_file) as f:
+            self.assertEqual(f.read(), "3")
+
+    def test_invalid_counter_file(self):
+        """测试计数器文件内容无法解析时从 1 重新开始"""
+        os.makedirs(os.path.dirname(self.counter_file))
+        with open(self.counter_file, 'w') as f:
+            f.write("not a number")
+        self.assertEqual(request.get_next_task_num(), 1)
+
+    @unittest.skipIf(request.fcntl is None, "当前平台没有 fcntl")
+    def test_concurrent_runs_get_distinct_nums(self):
+        """测试多个进程同时分配编号时互不重复"""
+        ctx = multiprocessing.get_context()
+        barrier = ctx.Barrier(NUM_PROCESSES)
+        queue = ctx.Queue()
+        processes = [
+            ctx.Process(target=_allocate_task_nums, args=(self.counter_file, barrier, queue))
+            for _ in range(NUM_PROCESSES)
+        ]
+        for p in processes:
+            p.start()
+
+        nums = []
+        for _ in processes:
+            nums.extend(queue.get(timeout=60))
+        for p in processes:
+            p.join(timeout=60)
+            self.assertEqual(p.exitcode, 0)
+
+        total = NUM_PROCESSES * NUMS_PER_PROCESS
+        self.assertEqual(sorted(nums), list(range(1, total + 1)))
+        with open(self.counter_file) as f:
+            self.assertEqual(f.read(), str(total))
+
+
+if __name__ == '__main__':
+    unittest.main()